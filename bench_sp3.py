@@ -0,0 +1,148 @@
+"""
+Mesures de performance du téléchargeur SP3
+Usage : python bench_sp3.py lzw [fichier.Z]
+        python bench_sp3.py parse [fichier.sp3]
+"""
+
+import math
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import sp3exe
+
+def make_synthetic_sp3(n_sats=32, n_epochs=288, interval=300, start=datetime(2021, 6, 1)):
+    """Génère un fichier SP3-c synthétique (GPS, GLONASS, Galileo, BeiDou) pour les mesures"""
+    sats = [f"{'GREC'[i // 40 % 4]}{i % 40 + 1:02d}" for i in range(n_sats)]
+    lines = [
+        f"#cP{start.year:4d} {start.month:2d} {start.day:2d}  0  0  0.00000000 {n_epochs:7d} ORBIT IGS14 HLM  IGS",
+        f"## 2160 172800.00000000 {interval:14.8f} 59366 0.0000000000000",
+    ]
+    for k in range(0, max(n_sats, 85), 17):
+        ids = ''.join(sats[k:k + 17]).ljust(51, ' ')
+        prefix = f"+  {n_sats:3d}   " if k == 0 else "+        "
+        lines.append(prefix + ids)
+    lines.append("%c G  cc GPS ccc cccc cccc cccc cccc ccccc ccccc ccccc ccccc")
+    lines.append("/* fichier synthétique de mesure")
+
+    for e in range(n_epochs):
+        t = start + timedelta(seconds=e * interval)
+        lines.append(f"*  {t.year:4d} {t.month:2d} {t.day:2d} {t.hour:2d} {t.minute:2d} {t.second:11.8f}")
+        for j, sat in enumerate(sats):
+            a = e * 0.01 + j
+            lines.append(f"P{sat}{26000 * math.cos(a):14.6f}{26000 * math.sin(a):14.6f}"
+                         f"{1000.0 * j + e:14.6f}{100.0 + j + e * 1e-3:14.6f}")
+    lines.append("EOF")
+    return ('\n'.join(lines) + '\n').encode()
+
+def bench_lzw(z_path=None, runs=3):
+    """Compare le décodeur LZW intégré à l'outil externe uncompress"""
+    print("⏱️  DÉCOMPRESSION .Z : décodeur intégré vs uncompress")
+    print("=" * 50)
+
+    if z_path:
+        compressed = Path(z_path).read_bytes()
+    else:
+        if not shutil.which('compress'):
+            print("❌ Aucun fichier .Z fourni et commande 'compress' introuvable")
+            return
+        raw = make_synthetic_sp3(n_sats=32, n_epochs=2880, interval=30)
+        compressed = subprocess.run(['compress', '-c'], input=raw, capture_output=True, check=True).stdout
+
+    print(f"📦 Entrée: {len(compressed):,} octets compressés")
+
+    best = float('inf')
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        decoder = sp3exe.UnixZDecoder()
+        chunks = [decoder.decompress(compressed[i:i + 8192]) for i in range(0, len(compressed), 8192)]
+        output = b''.join(chunks)
+        best = min(best, time.perf_counter() - t0)
+    print(f"🐍 Décodeur intégré: {best * 1000:.1f} ms ({len(output) / best / 1e6:.1f} Mo/s)")
+
+    tool = shutil.which('uncompress') or shutil.which('gzip')
+    if not tool:
+        print("⚠️ Outil externe introuvable, comparaison impossible")
+        return
+
+    best_ext = float('inf')
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        external = subprocess.run([tool, '-c'] if 'uncompress' in tool else [tool, '-dc'],
+                                  input=compressed, capture_output=True, check=True).stdout
+        best_ext = min(best_ext, time.perf_counter() - t0)
+    print(f"🔧 {Path(tool).name} (processus externe): {best_ext * 1000:.1f} ms")
+    print(f"✅ Sorties identiques: {'oui' if external == output else 'NON'}")
+
+def read_sp3_naive(file_path):
+    """Référence : décodage ligne à ligne avec float() sur chaque champ"""
+    header = sp3exe.read_sp3_header(file_path)
+    column = {sat: i for i, sat in enumerate(header['satellites'])}
+    epochs = []
+    rows = []
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if line.startswith('*'):
+                epochs.append(sp3exe.sp3_epoch_seconds(line))
+            elif line.startswith('P') and epochs:
+                sat = column.get(sp3exe.sp3_satellite(line[1:4]))
+                if sat is not None:
+                    rows.append((len(epochs) - 1, sat, float(line[4:18]), float(line[18:32]),
+                                 float(line[32:46]), float(line[46:60])))
+    
+    records = sp3exe.np.full((len(epochs), len(header['satellites']), 4), sp3exe.np.nan)
+    for e, sat, x, y, z, clock in rows:
+        records[e, sat] = (x, y, z, clock)
+    return records
+
+def bench_parse(sp3_path=None, runs=3):
+    """Compare le décodage vectorisé des enregistrements P à une boucle ligne à ligne"""
+    print("⏱️  LECTURE SP3 : décodage vectorisé vs boucle ligne à ligne")
+    print("=" * 50)
+    
+    if sp3exe.np is None:
+        print("❌ NumPy est requis pour cette mesure")
+        return
+    
+    temp_dir = None
+    if not sp3_path:
+        # Journée 30S multi-GNSS : 2880 époques x 120 satellites
+        temp_dir = tempfile.TemporaryDirectory()
+        sp3_path = Path(temp_dir.name) / "synthetique.sp3"
+        sp3_path.write_bytes(make_synthetic_sp3(n_sats=120, n_epochs=2880, interval=30))
+    
+    try:
+        print(f"📦 Entrée: {Path(sp3_path).stat().st_size / 1e6:.1f} Mo")
+        
+        best_naive = float('inf')
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            naive = read_sp3_naive(sp3_path)
+            best_naive = min(best_naive, time.perf_counter() - t0)
+        print(f"🐢 Boucle ligne à ligne: {best_naive * 1000:.0f} ms")
+        
+        best = float('inf')
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            data = sp3exe.read_sp3(sp3_path)
+            best = min(best, time.perf_counter() - t0)
+        print(f"🚀 Décodage vectorisé: {best * 1000:.0f} ms (x{best_naive / best:.1f})")
+        print(f"🛰️ {data.records.shape[0]} époques, {data.records.shape[1]} satellites")
+        print(f"✅ Résultats identiques: "
+              f"{'oui' if sp3exe.np.array_equal(naive, data.records, equal_nan=True) else 'NON'}")
+    finally:
+        if temp_dir:
+            temp_dir.cleanup()
+
+if __name__ == "__main__":
+    benches = {'lzw': bench_lzw, 'parse': bench_parse}
+
+    if len(sys.argv) < 2 or sys.argv[1] not in benches:
+        print(f"Usage: python bench_sp3.py {'|'.join(benches)} [arguments]")
+        sys.exit(1)
+
+    benches[sys.argv[1]](*sys.argv[2:])
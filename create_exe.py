@@ -45,6 +45,7 @@ def create_exe():
         "--name=SP3_Downloader",
         "--clean",
         "--noconfirm",
+        f"--add-data=sp3_products.json{os.pathsep}.",
         source_file
     ]
     
@@ -10,11 +10,40 @@ Modifications v2.2:
 import os
 import sys
 import json
+import argparse
+import random
 import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+from urllib3.util.retry import Retry
 import gzip
+import zlib
+import hashlib
+import shutil
+import tempfile
 import logging
-from datetime import datetime, timedelta
+import mmap
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# NumPy est optionnel : seule la lecture complète des enregistrements SP3 en dépend
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def setup_logging():
     """Configure le logging"""
@@ -53,10 +82,59 @@ class ConfigManager:
                 ),
             "output_directory": r"C:\1-Data\01-Projet\ProjetPY\Test_GNSS",
             "user_name": "Utilisateur",
-            "auto_cleanup": True
+            "auto_cleanup": True,
+            "use_directory_listing": True,
+            "probe_workers": 8,
+            "listing_cache_ttl_minutes": 30,
+            "negative_cache_ttl_minutes": {
+                "ultra_rapid": 15,
+                "rapid": 60,
+                "final": 360,
+                "final_old_week": 7 * 24 * 60
+            },
+            "parallel_tiers": True,
+            "download_retries": 5,
+            "streaming_decompression": True,
+            "resumable_streaming": False,
+            "bulk_workers": 4,
+            "pool_maxsize": 0,
+            "max_retries": 3,
+            "backoff_factor": 0.5,
+            "backoff_jitter": 0.5,
+            "head_timeout": 8,
+            "get_timeout": 120,
+            "min_timeout": 2,
+            "min_read_timeout": 15,
+            "verify_checksums": True,
+            "checksum_retries": 2,
+            "use_product_store": True,
+            "store_directory": "",
+            "use_catalog": True,
+            "enabled_centers": [],
+            "adaptive_ordering": True,
+            # Miroirs des produits : gabarit de répertoire par semaine GPS, jeton JWT si auth
+            # (un miroir local s'ajoute de la même façon, ex. "base": "http://serveur/sp3")
+            "mirrors": [
+                {"name": "CDDIS", "base": "https://cddis.nasa.gov/archive/gnss/products",
+                 "layout": "{base}/{week:04d}/", "auth": True},
+                {"name": "IGN", "base": "https://igs.ign.fr/pub/igs/products",
+                 "layout": "{base}/{week:04d}/", "auth": False},
+                {"name": "BKG", "base": "https://igs.bkg.bund.de/root_ftp/IGS/products",
+                 "layout": "{base}/{week:04d}/", "auth": False}
+            ],
+            "race_mirrors": True,
+            "mirror_stats_ttl_days": 7,
+            "segmented_downloads": True,
+            "segment_threshold_mb": 16,
+            "segment_workers": 4,
+            "build_epoch_index": True
         }
         
         self.config = self.load_config()
+        
+        # Catalogue déclaratif des produits (centres, campagnes, heures d'émission)
+        self.products_file = self.config_dir / "sp3_products.json"
+        self.products = self.load_products()
     
     def load_config(self):
         """Charge la configuration depuis le fichier"""
@@ -75,6 +153,21 @@ class ConfigManager:
             logger.error(f"Erreur chargement config: {e}")
             return self.default_config.copy()
     
+    def load_products(self):
+        """Charge le catalogue des produits : fichier utilisateur, sinon celui fourni avec l'application"""
+        bundled_file = Path(getattr(sys, '_MEIPASS', Path(__file__).parent)) / "sp3_products.json"
+        
+        for products_file in (self.products_file, bundled_file):
+            try:
+                if products_file.exists():
+                    with open(products_file, 'r', encoding='utf-8') as f:
+                        return json.load(f)
+            except Exception as e:
+                logger.error(f"Erreur chargement catalogue produits {products_file}: {e}")
+        
+        logger.error("Catalogue des produits introuvable (sp3_products.json)")
+        return {"products": {}}
+    
     def save_config(self):
         """Sauvegarde la configuration"""
         try:
@@ -93,6 +186,1650 @@ class ConfigManager:
         """Définit une valeur de configuration"""
         self.config[key] = value
 
+GPS_EPOCH = datetime(1980, 1, 6)
+
+def utc_now():
+    """Heure UTC courante (naïve, comme toutes les dates de produits)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def http_date(value):
+    """Date d'un en-tête HTTP (Last-Modified) en UTC naïve, ou None"""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+# Seuls les produits récents renseignent le délai de publication : un produit d'archive
+# a pu être republié ou recopié sur un miroir bien après sa mise en ligne initiale
+RELEASE_OBSERVATION_HOURS = 31 * 24
+
+PRODUCT_TYPES = {'FIN': 'final', 'RAP': 'rapid', 'ULT': 'ultra_rapid'}
+TYPE_CODES = {v: k for k, v in PRODUCT_TYPES.items()}
+
+class ProductName(namedtuple('ProductName', 'center campaign type start period sampling '
+                                            'content format version compression legacy')):
+    """
+    Nom de produit IGS décodé : nom long (IGS20) ou nom court hérité (igs/igr/igu/cod...)
+    Conversion dans les deux sens : ProductName.parse(nom) / produit.filename()
+    """
+    
+    __slots__ = ()
+    
+    LONG_PATTERN = re.compile(
+        r'(?P<center>[A-Z0-9]{3})(?P<version>\d)(?P<campaign>[A-Z]{3})(?P<type>[A-Z]{3})_'
+        r'(?P<year>\d{4})(?P<doy>\d{3})(?P<hour>\d{2})(?P<minute>\d{2})_'
+        r'(?P<period>\d{2}[A-Z])_(?P<sampling>\d{2}[A-Z])_(?P<content>[A-Z]{3})\.(?P<format>[A-Z0-9]{3})'
+        r'(?P<compression>\.gz|\.Z)?')
+    SHORT_PATTERN = re.compile(
+        r'(?P<center>[a-z]{3})(?P<kind>[ru]?)(?P<week>\d{4})(?P<dow>\d)(?:_(?P<hour>\d{2}))?'
+        r'\.(?P<format>sp3)(?P<compression>\.gz|\.Z)?', re.IGNORECASE)
+    
+    # Préfixes courts des produits combinés IGS
+    IGS_SHORT = {'FIN': 'igs', 'RAP': 'igr', 'ULT': 'igu'}
+    
+    @classmethod
+    def long(cls, center, campaign, type_code, start, period, sampling,
+             content='ORB', format='SP3', version='0', compression='.gz'):
+        """Produit au format long IGS20"""
+        return cls(center, campaign, type_code, start, period, sampling,
+                   content, format, version, compression, False)
+    
+    @classmethod
+    def short(cls, center, type_code, start, compression='.Z'):
+        """Produit au format court hérité (avant la semaine GPS 2238)"""
+        return cls(center, None, type_code, start, None, None,
+                   'ORB', 'SP3', None, compression, True)
+    
+    @classmethod
+    def parse(cls, name):
+        """Décode un nom de fichier, ou None s'il ne correspond à aucun format connu"""
+        match = cls.LONG_PATTERN.fullmatch(name)
+        if match:
+            start = datetime(int(match['year']), 1, 1) + timedelta(
+                days=int(match['doy']) - 1, hours=int(match['hour']), minutes=int(match['minute']))
+            return cls(match['center'], match['campaign'], match['type'], start,
+                       match['period'], match['sampling'], match['content'], match['format'],
+                       match['version'], match['compression'] or '', False)
+        
+        match = cls.SHORT_PATTERN.fullmatch(name)
+        if match:
+            center = match['center'].lower()
+            kind = match['kind'].lower()
+            # igr/igu, codr/codu... : la lettre r ou u indique rapide ou ultra-rapide
+            if center in ('igr', 'igu'):
+                kind = center[2]
+                center = 'igs'
+            type_code = {'r': 'RAP', 'u': 'ULT'}.get(kind, 'FIN')
+            start = GPS_EPOCH + timedelta(weeks=int(match['week']), days=int(match['dow']),
+                                          hours=int(match['hour'] or 0))
+            return cls.short(center.upper(), type_code, start, match['compression'] or '')
+        
+        return None
+    
+    @classmethod
+    def index(cls, names):
+        """Décode un listing complet : dictionnaire nom -> ProductName (noms inconnus ignorés)"""
+        parsed = {}
+        for name in names:
+            product = cls.parse(name)
+            if product is not None:
+                parsed[name] = product
+        return parsed
+    
+    @property
+    def product_type(self):
+        """Type de produit du téléchargeur ('final', 'rapid', 'ultra_rapid')"""
+        return PRODUCT_TYPES.get(self.type)
+    
+    @property
+    def gps_week(self):
+        return (self.start - GPS_EPOCH).days // 7
+    
+    @property
+    def start_epoch(self):
+        """Début du produit en secondes GPS"""
+        return int((self.start - GPS_EPOCH).total_seconds())
+    
+    def filename(self):
+        """Reconstruit le nom de fichier"""
+        if not self.legacy:
+            doy = self.start.timetuple().tm_yday
+            return (f"{self.center}{self.version}{self.campaign}{self.type}_"
+                    f"{self.start.year}{doy:03d}{self.start.hour:02d}{self.start.minute:02d}_"
+                    f"{self.period}_{self.sampling}_{self.content}.{self.format}{self.compression}")
+        
+        days = (self.start - GPS_EPOCH).days
+        if self.center == 'IGS':
+            prefix = self.IGS_SHORT[self.type]
+        else:
+            prefix = self.center.lower() + {'FIN': '', 'RAP': 'r', 'ULT': 'u'}[self.type]
+        hour = f"_{self.start.hour:02d}" if self.type == 'ULT' else ""
+        return f"{prefix}{days // 7:04d}{days % 7}{hour}.sp3{self.compression}"
+
+def sp3_satellite(field):
+    """Identifiant de satellite normalisé ("G 1" -> "G01"), ou None si le champ est vide"""
+    if len(field) != 3:
+        return None
+    sat_id = field[0] + field[1:].replace(' ', '0')
+    return sat_id if sat_id[0].isalpha() and sat_id[1:].isdigit() else None
+
+def sp3_epoch_seconds(line):
+    """Secondes GPS (dans le système de temps du fichier) d'une ligne d'époque '*'"""
+    epoch = datetime(int(line[3:7]), int(line[8:10]), int(line[11:13]), int(line[14:16]), int(line[17:19]))
+    return int((epoch - GPS_EPOCH).total_seconds()) + int(round(float(line[20:31])))
+
+def read_sp3_header(file_path):
+    """
+    Lit l'en-tête d'un fichier SP3-c/SP3-d (jusqu'à la première époque '*')
+    Retourne satellites et décompte par constellation, précisions '++', champs '%c'/'%f',
+    intervalle, système de temps, agence, nombre d'époques annoncé et commentaires '/*'
+    Coût constant quelle que soit la taille du fichier
+    """
+    header = {'version': None, 'pos_vel': None, 'start': None, 'n_epochs': None,
+              'coordinate_system': None, 'orbit_type': None, 'agency': None,
+              'gps_week': None, 'interval': None,
+              'n_satellites': None, 'satellites': [], 'constellations': {}, 'accuracy': [],
+              'file_type': None, 'time_system': None, 'base_pos_vel': None, 'base_clock': None,
+              'comments': []}
+    
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            # Première époque, ou ligne étrangère à un en-tête SP3 : fin de l'en-tête
+            if not line.startswith(('#', '+', '%', '/')):
+                break
+            if line.startswith('#') and not line.startswith('##'):
+                header['version'] = line[1:2]
+                header['pos_vel'] = line[2:3]
+                try:
+                    header['start'] = datetime(int(line[3:7]), int(line[8:10]), int(line[11:13]),
+                                               int(line[14:16]), int(line[17:19]))
+                except ValueError:
+                    pass
+                header['n_epochs'] = int(line[32:39]) if line[32:39].strip().isdigit() else None
+                header['coordinate_system'] = line[46:51].strip() or None
+                header['orbit_type'] = line[52:55].strip() or None
+                header['agency'] = line[55:60].strip() or None
+            elif line.startswith('##'):
+                try:
+                    header['gps_week'] = int(line[3:7])
+                    header['interval'] = float(line[24:38])
+                except ValueError:
+                    pass
+            elif line.startswith('++'):
+                # SP3-d : autant de lignes '++' que de lignes '+' (17 satellites par ligne)
+                header['accuracy'].extend(int(line[pos:pos+3]) if line[pos:pos+3].strip().isdigit() else 0
+                                          for pos in range(9, 60, 3))
+            elif line.startswith('+'):
+                if header['n_satellites'] is None and line[3:6].strip().isdigit():
+                    header['n_satellites'] = int(line[3:6])
+                for pos in range(9, 60, 3):
+                    sat_id = sp3_satellite(line[pos:pos+3])
+                    if sat_id:
+                        header['satellites'].append(sat_id)
+            elif line.startswith('%c') and header['file_type'] is None:
+                header['file_type'] = line[3:5].strip() or None
+                header['time_system'] = line[9:12].strip() or None
+            elif line.startswith('%f') and header['base_pos_vel'] is None:
+                try:
+                    header['base_pos_vel'] = float(line[3:13])
+                    header['base_clock'] = float(line[14:26])
+                except ValueError:
+                    pass
+            elif line.startswith('/*'):
+                comment = line[3:].rstrip()
+                if comment:
+                    header['comments'].append(comment)
+    
+    if header['n_satellites']:
+        header['satellites'] = header['satellites'][:header['n_satellites']]
+    header['accuracy'] = header['accuracy'][:len(header['satellites'])]
+    for sat_id in header['satellites']:
+        header['constellations'][sat_id[0]] = header['constellations'].get(sat_id[0], 0) + 1
+    return header
+
+SP3Data = namedtuple('SP3Data', 'header satellites epochs records velocities accuracy bad')
+
+# Valeur d'horloge invalide (999999.999999 µs) ; une position invalide vaut 0.000000
+SP3_BAD_CLOCK = 999999.0
+
+# Enregistrements P/V : identifiant (colonnes 2-4) puis 4 champs F14.6 (colonnes 5-60)
+SP3_RECORD_WIDTH = 60
+SP3_FIELD_WIDTH = 14
+SP3_DECODE_BATCH = 1 << 18
+SP3_SCAN_BLOCK = 64 * 1024 * 1024
+
+def sp3_line_starts(data):
+    """Positions de début de ligne d'un tampon d'octets (uint8), par blocs pour borner la mémoire"""
+    starts = [np.zeros(1, dtype=np.int64)]
+    for offset in range(0, len(data), SP3_SCAN_BLOCK):
+        newlines = np.flatnonzero(data[offset:offset + SP3_SCAN_BLOCK] == ord('\n'))
+        starts.append(newlines.astype(np.int64) + (offset + 1))
+    starts = np.concatenate(starts)
+    return starts[starts < len(data)]
+
+def sp3_satellite_codes(ids):
+    """Code entier d'identifiants de satellite (n, 3) uint8, blancs remplacés par des zéros ("G 1" = "G01")"""
+    ids = ids.astype(np.int32)
+    ids[:, 1:][ids[:, 1:] == ord(' ')] = ord('0')
+    return (ids[:, 0] << 16) | (ids[:, 1] << 8) | ids[:, 2]
+
+def decode_sp3_fields(lines):
+    """
+    Décode en bloc les 4 champs F14.6 de lignes P/V (tableau (n, 60) uint8)
+    Arithmétique entière sur les chiffres en colonnes fixes : aucun appel float() par ligne
+    """
+    fields = lines[:, 4:SP3_RECORD_WIDTH].reshape(-1, 4, SP3_FIELD_WIDTH)
+    point = SP3_FIELD_WIDTH - 7
+    if not (fields[:, :, point] == ord('.')).all():
+        # Champs hors format F14.6 : conversion générique des chaînes, toujours en bloc
+        return np.ascontiguousarray(fields).view(f'S{SP3_FIELD_WIDTH}')[..., 0].astype(np.float64)
+    
+    digits = fields - ord('0')
+    digits[digits > 9] = 0
+    mantissa = np.zeros(fields.shape[:2], dtype=np.int64)
+    for column in range(SP3_FIELD_WIDTH):
+        if column != point:
+            mantissa *= 10
+            mantissa += digits[:, :, column]
+    
+    values = mantissa / 1e6
+    values[(fields == ord('-')).any(axis=2)] *= -1
+    return values
+
+def decode_sp3_records(data, starts, epoch_starts, sat_codes, shape):
+    """
+    Répartit les lignes P ou V (positions starts dans data) dans un tableau dense
+    (époques, satellites, 4) ; les absents valent NaN
+    """
+    dense = np.full(shape, np.nan)
+    epoch_index = np.searchsorted(epoch_starts, starts) - 1
+    starts = starts[epoch_index >= 0]
+    epoch_index = epoch_index[epoch_index >= 0]
+    
+    order = np.argsort(sat_codes)
+    sorted_codes = sat_codes[order]
+    
+    # Vue glissante (sans copie) : la ligne commençant à l'octet k est windows[k]
+    if len(data) < SP3_RECORD_WIDTH:
+        return dense
+    windows = np.lib.stride_tricks.sliding_window_view(data, SP3_RECORD_WIDTH)
+    starts = np.minimum(starts, len(windows) - 1)
+    
+    for batch in range(0, len(starts), SP3_DECODE_BATCH):
+        # Regroupement des lignes dans un tampon contigu de largeur fixe
+        lines = windows[starts[batch:batch + SP3_DECODE_BATCH]]
+        
+        codes = sp3_satellite_codes(lines[:, 1:4])
+        position = np.minimum(np.searchsorted(sorted_codes, codes), max(len(sorted_codes) - 1, 0))
+        known = sorted_codes[position] == codes if len(sorted_codes) else np.zeros(len(codes), bool)
+        
+        values = decode_sp3_fields(lines)
+        dense[epoch_index[batch:batch + SP3_DECODE_BATCH][known], order[position[known]]] = values[known]
+    
+    return dense
+
+def sp3_sat_codes(satellites):
+    """Codes entiers des satellites de l'en-tête"""
+    return sp3_satellite_codes(np.frombuffer(''.join(satellites).encode(), dtype=np.uint8).reshape(-1, 3))
+
+def sp3_epoch_starts(data, starts=None):
+    """Positions des lignes d'époque '*' et leurs secondes GPS"""
+    if starts is None:
+        starts = sp3_line_starts(data)
+    epoch_starts = starts[data[starts] == ord('*')]
+    epochs = np.array([sp3_epoch_seconds(bytes(data[start:start + 31]).decode('ascii'))
+                       for start in epoch_starts], dtype=np.int64)
+    return epoch_starts, epochs
+
+def parse_sp3_body(data, satellites):
+    """
+    Décode une portion de fichier SP3 (tampon uint8 commençant en début de ligne)
+    Retourne (époques, positions, vitesses ou None, masque des valeurs invalides)
+    """
+    starts = sp3_line_starts(data)
+    epoch_starts, epochs = sp3_epoch_starts(data, starts)
+    first = data[starts]
+    sat_codes = sp3_sat_codes(satellites)
+    shape = (len(epochs), len(satellites), 4)
+    
+    positions = decode_sp3_records(data, starts[first == ord('P')], epoch_starts, sat_codes, shape)
+    velocity_starts = starts[first == ord('V')]
+    velocities = (decode_sp3_records(data, velocity_starts, epoch_starts, sat_codes, shape)
+                  if len(velocity_starts) else None)
+    
+    return epochs, positions, velocities, sp3_bad_values(positions)
+
+def sp3_bad_values(positions):
+    """Masque des valeurs absentes (NaN), positions nulles et horloges 999999.999999"""
+    bad = np.isnan(positions)
+    bad[..., 3] |= positions[..., 3] >= SP3_BAD_CLOCK
+    bad[..., :3] |= (positions[..., :3] == 0).all(axis=-1, keepdims=True)
+    return bad
+
+def read_sp3(file_path):
+    """
+    Lit un fichier SP3-c/SP3-d complet (NumPy requis)
+    epochs : secondes GPS (int64) ; records : (époques, satellites, 4) X, Y, Z (km) et horloge (µs)
+    velocities : même forme (dm/s, 10⁻⁴ µs/s) si le fichier en contient, sinon None
+    accuracy : exposants de précision '++' par satellite ; bad : valeurs absentes ou invalides
+    """
+    if np is None:
+        raise ImportError("NumPy est requis pour lire les enregistrements SP3")
+    
+    header = read_sp3_header(file_path)
+    
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Fichier SP3 vide")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = np.frombuffer(mapped, dtype=np.uint8)
+            try:
+                epochs, positions, velocities, bad = parse_sp3_body(data, header['satellites'])
+            finally:
+                # Aucune vue ne doit survivre à la fermeture du fichier projeté
+                del data
+    
+    return SP3Data(header, header['satellites'], epochs, positions, velocities,
+                   np.asarray(header['accuracy'], dtype=np.int16), bad)
+
+def sp3_index_path(file_path):
+    """Fichier annexe de l'index des époques, à côté du produit"""
+    return Path(str(file_path) + '.idx.npz')
+
+def build_sp3_index(file_path):
+    """
+    Construit et enregistre l'index des époques d'un fichier SP3 :
+    secondes GPS et position en octets de chaque ligne '*', plus la fin des enregistrements
+    """
+    if np is None:
+        raise ImportError("NumPy est requis pour indexer un fichier SP3")
+    
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = np.frombuffer(mapped, dtype=np.uint8)
+        try:
+            epoch_starts, epochs = sp3_epoch_starts(data)
+            # Fin des enregistrements : ligne "EOF" si présente, sinon fin du fichier
+            eof = mapped.rfind(b'\nEOF')
+            end = eof + 1 if eof >= 0 else len(mapped)
+        finally:
+            del data
+    
+    index = {'epochs': epochs, 'offsets': epoch_starts, 'end': end,
+             'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    # Écriture atomique (np.savez ajoute l'extension .npz au nom temporaire)
+    index_path = sp3_index_path(file_path)
+    temp_path = index_path.with_name(index_path.name + '.tmp.npz')
+    np.savez(temp_path, **index)
+    os.replace(temp_path, index_path)
+    return index
+
+def load_sp3_index(file_path):
+    """Index des époques depuis le fichier annexe, reconstruit s'il est absent ou périmé"""
+    if np is None:
+        raise ImportError("NumPy est requis pour indexer un fichier SP3")
+    
+    file_path = Path(file_path)
+    index_path = sp3_index_path(file_path)
+    if index_path.exists():
+        try:
+            stat = file_path.stat()
+            with np.load(index_path) as stored:
+                index = {key: stored[key] for key in stored.files}
+            if int(index['size']) == stat.st_size and int(index['mtime_ns']) == stat.st_mtime_ns:
+                return index
+        except Exception as e:
+            logger.warning(f"Index d'époques illisible {index_path.name}: {e}")
+    return build_sp3_index(file_path)
+
+def read_sp3_window(file_path, start, end):
+    """
+    Lit uniquement les époques de [start, end) (datetime ou secondes GPS)
+    L'index annexe donne les positions : seule la fenêtre du fichier projeté est décodée
+    """
+    if isinstance(start, datetime):
+        start = int((start - GPS_EPOCH).total_seconds())
+    if isinstance(end, datetime):
+        end = int((end - GPS_EPOCH).total_seconds())
+    
+    header = read_sp3_header(file_path)
+    index = load_sp3_index(file_path)
+    first = int(np.searchsorted(index['epochs'], start, side='left'))
+    last = int(np.searchsorted(index['epochs'], end, side='left'))
+    
+    satellites = header['satellites']
+    if first >= last:
+        empty = np.empty((0, len(satellites), 4))
+        return SP3Data(header, satellites, np.empty(0, dtype=np.int64), empty, None,
+                       np.asarray(header['accuracy'], dtype=np.int16), np.empty(empty.shape, dtype=bool))
+    
+    begin = int(index['offsets'][first])
+    stop = int(index['offsets'][last]) if last < len(index['offsets']) else int(index['end'])
+    
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = np.frombuffer(mapped, dtype=np.uint8)[begin:stop]
+        try:
+            epochs, positions, velocities, bad = parse_sp3_body(data, satellites)
+        finally:
+            del data
+    
+    return SP3Data(header, satellites, epochs, positions, velocities,
+                   np.asarray(header['accuracy'], dtype=np.int16), bad)
+
+class MemoryBudgetCache:
+    """
+    Cache LRU de tableaux NumPy borné en octets
+    Peut être partagé entre plusieurs lecteurs pour un budget mémoire global
+    """
+    
+    def __init__(self, budget_mb=512):
+        self.budget = int(float(budget_mb) * 1024 * 1024)
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        """Ajoute une entrée (tuple de tableaux) et évince les moins récemment utilisées"""
+        nbytes = sum(array.nbytes for array in value)
+        with self.lock:
+            if key in self.entries:
+                self.size -= sum(array.nbytes for array in self.entries.pop(key))
+            self.entries[key] = value
+            self.size += nbytes
+            while self.size > self.budget and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= sum(array.nbytes for array in evicted)
+        return value
+
+class SP3Reader:
+    """
+    Lecteur paresseux d'un fichier SP3 projeté en mémoire (positions et horloges)
+    Les blocs d'époques et les colonnes de satellites ne sont décodés qu'au premier accès,
+    puis conservés dans un cache LRU borné : reader['G05'], reader[t0:t1], reader.window(début, fin)
+    """
+    
+    def __init__(self, file_path, memory_budget_mb=512, block_epochs=3600, cache=None):
+        if np is None:
+            raise ImportError("NumPy est requis pour lire les enregistrements SP3")
+        
+        self.file_path = Path(file_path)
+        self.header = read_sp3_header(self.file_path)
+        self.satellites = self.header['satellites']
+        self.column = {sat_id: i for i, sat_id in enumerate(self.satellites)}
+        self.accuracy = np.asarray(self.header['accuracy'], dtype=np.int16)
+        
+        index = load_sp3_index(self.file_path)
+        self.epochs = index['epochs']
+        self.offsets = np.append(index['offsets'], int(index['end']))
+        self.block_epochs = max(1, int(block_epochs))
+        self.cache = cache or MemoryBudgetCache(memory_budget_mb)
+        
+        self.file = open(self.file_path, 'rb')
+        self.mapped = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = np.frombuffer(self.mapped, dtype=np.uint8)
+    
+    def close(self):
+        if self.data is not None:
+            # Les tableaux en cache sont des copies : seule la vue directe retient la projection
+            self.data = None
+            self.mapped.close()
+            self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __len__(self):
+        return len(self.epochs)
+    
+    def __getitem__(self, key):
+        """reader['G05'] : colonne d'un satellite ; reader[i:j] : tranche d'époques (indices)"""
+        if isinstance(key, str):
+            return self.satellite(key)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self.epochs))
+            if step != 1:
+                raise ValueError("Tranche d'époques avec pas non supportée")
+            return self.epoch_slice(start, stop)
+        raise TypeError(f"Clé non supportée: {key!r}")
+    
+    def block_range(self, block):
+        first = block * self.block_epochs
+        return first, min(first + self.block_epochs, len(self.epochs))
+    
+    def block_lines(self, first, last):
+        """Tampon des époques [first, last) et positions relatives de leurs lignes '*'"""
+        begin, stop = int(self.offsets[first]), int(self.offsets[last])
+        return self.data[begin:stop], self.offsets[first:last] - begin
+    
+    def block(self, block):
+        """Bloc d'époques décodé (positions, masque), depuis le cache si possible"""
+        key = (str(self.file_path), 'block', block)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        first, last = self.block_range(block)
+        data, epoch_starts = self.block_lines(first, last)
+        starts = sp3_line_starts(data)
+        positions = decode_sp3_records(data, starts[data[starts] == ord('P')], epoch_starts,
+                                       sp3_sat_codes(self.satellites), (last - first, len(self.satellites), 4))
+        return self.cache.put(key, (positions, sp3_bad_values(positions)))
+    
+    def epoch_slice(self, start, stop):
+        """Époques d'indices [start, stop) assemblées à partir des blocs"""
+        parts = []
+        for block in range(start // self.block_epochs, -(-stop // self.block_epochs)):
+            first, _ = self.block_range(block)
+            positions, bad = self.block(block)
+            lo, hi = max(start - first, 0), min(stop - first, len(positions))
+            parts.append((positions[lo:hi], bad[lo:hi]))
+        
+        shape = (0, len(self.satellites), 4)
+        positions = np.concatenate([p for p, _ in parts]) if parts else np.empty(shape)
+        bad = np.concatenate([b for _, b in parts]) if parts else np.empty(shape, dtype=bool)
+        return SP3Data(self.header, self.satellites, self.epochs[start:stop], positions, None, self.accuracy, bad)
+    
+    def window(self, start, end):
+        """Époques de [start, end) (datetime ou secondes GPS)"""
+        if isinstance(start, datetime):
+            start = int((start - GPS_EPOCH).total_seconds())
+        if isinstance(end, datetime):
+            end = int((end - GPS_EPOCH).total_seconds())
+        first = int(np.searchsorted(self.epochs, start, side='left'))
+        last = int(np.searchsorted(self.epochs, end, side='left'))
+        return self.epoch_slice(first, max(first, last))
+    
+    def satellite(self, sat_id):
+        """
+        Colonne complète d'un satellite (époques, 1, 4) : seules ses lignes P sont décodées
+        Les blocs déjà en cache sont réutilisés sans nouveau décodage
+        """
+        if sat_id not in self.column:
+            raise KeyError(f"Satellite absent de l'en-tête: {sat_id}")
+        
+        key = (str(self.file_path), 'satellite', sat_id)
+        cached = self.cache.get(key)
+        if cached is None:
+            target = sp3_sat_codes([sat_id])
+            index = self.column[sat_id]
+            parts = []
+            for block in range(-(-len(self.epochs) // self.block_epochs)):
+                decoded = self.cache.get((str(self.file_path), 'block', block))
+                if decoded is not None:
+                    parts.append(decoded[0][:, index:index + 1])
+                    continue
+                
+                first, last = self.block_range(block)
+                data, epoch_starts = self.block_lines(first, last)
+                starts = sp3_line_starts(data)
+                starts = starts[data[starts] == ord('P')]
+                codes = sp3_satellite_codes(data[np.minimum(starts[:, None] + np.arange(1, 4), len(data) - 1)])
+                parts.append(decode_sp3_records(data, starts[codes == target[0]], epoch_starts, target,
+                                                (last - first, 1, 4)))
+            
+            positions = np.concatenate(parts) if parts else np.empty((0, 1, 4))
+            cached = self.cache.put(key, (positions, sp3_bad_values(positions)))
+        
+        positions, bad = cached
+        return SP3Data(self.header, [sat_id], self.epochs, positions, None,
+                       self.accuracy[self.column[sat_id]:self.column[sat_id] + 1], bad)
+
+class PublicationSchedule:
+    """
+    Modèle de publication : latence (en heures) entre le début d'un produit et sa mise en ligne
+    Latences configurées par type et par centre, remplacées par celles constatées dans
+    l'historique du catalogue (Last-Modified), à la hausse comme à la baisse
+    """
+    
+    def __init__(self, catalog, observed=None):
+        self.configured = {}
+        for product_type, spec in catalog.get('products', {}).items():
+            latency = spec.get('publication_latency_hours', {})
+            self.configured[product_type] = {
+                'default': float(latency.get('default', 0)),
+                'centers': {c.upper(): float(h) for c, h in latency.get('centers', {}).items()}
+            }
+        # {(centre, type): latence de publication constatée, en heures}
+        self.observed = observed or {}
+    
+    def latency(self, center, product_type):
+        """Latence attendue pour un centre et un type de produit"""
+        observed = self.observed.get((center, product_type))
+        if observed is not None:
+            return observed
+        configured = self.configured.get(product_type, {'default': 0.0, 'centers': {}})
+        return configured['centers'].get(center, configured['default'])
+    
+    def latencies(self, product_type):
+        """Latences attendues d'un type de produit : valeur par défaut et chaque centre connu"""
+        configured = self.configured.get(product_type, {'default': 0.0, 'centers': {}})
+        centers = set(configured['centers'])
+        centers.update(center for center, t in self.observed if t == product_type)
+        return [configured['default'], *(self.latency(center, product_type) for center in centers)]
+    
+    def earliest(self, product_type):
+        """Plus petite latence attendue pour un type de produit, tous centres confondus"""
+        return min(self.latencies(product_type))
+    
+    def latest(self, product_type):
+        """Plus grande latence attendue : au-delà, tous les centres ont publié"""
+        return max(self.latencies(product_type))
+    
+    def release_time(self, product):
+        """Heure UTC de publication attendue d'un produit (ProductName)"""
+        return product.start + timedelta(hours=self.latency(product.center, product.product_type))
+    
+    def released(self, product, now):
+        return self.release_time(product) <= now
+
+class CandidateGenerator:
+    """
+    Générateur de candidats compilé depuis le catalogue déclaratif des produits
+    Les modèles de noms sont précalculés une fois : seule la date varie à la génération
+    Seuls les candidats dont l'heure de publication attendue est passée sont émis
+    """
+    
+    def __init__(self, catalog, enabled_centers=None, schedule=None):
+        self.legacy_week = int(catalog.get('legacy_week', 2238))
+        self.time_intervals = list(catalog.get('time_intervals', []))
+        
+        # Centres retenus (vide : tous)
+        self.enabled_centers = {c.upper() for c in enabled_centers or []}
+        self.schedule = schedule or PublicationSchedule(catalog)
+        
+        self.compiled = {}
+        for product_type, spec in catalog.get('products', {}).items():
+            self.compiled[product_type] = {
+                'long': [self.compile_long(spec['long'])] if spec.get('long') else [],
+                'short': [self.compile_short(group) for group in spec.get('short', [])],
+                'legacy': [self.compile_short(group) for group in spec.get('legacy', [])]
+            }
+    
+    def center_enabled(self, center):
+        return not self.enabled_centers or center.upper() in self.enabled_centers
+    
+    def compile_long(self, spec):
+        """Modèles au format long, ordonnés par intervalle puis groupe puis centre"""
+        templates = []
+        for interval in self.time_intervals:
+            for group in spec['groups']:
+                for code in group['centers']:
+                    # "COD0MGX" : centre, version, campagne
+                    center, version, campaign = code[:3], code[3], code[4:7]
+                    if self.center_enabled(center):
+                        templates.append(ProductName.long(center, campaign, group['type'], None,
+                                                          group['period'], interval, version=version))
+        return {
+            'issue_hours': spec.get('issue_hours', [0]),
+            'previous_day_hours': spec.get('previous_day_hours', []),
+            'templates': templates
+        }
+    
+    def compile_short(self, group):
+        """Modèles au format court hérité"""
+        return {
+            'issue_hours': group.get('issue_hours', [0]),
+            'previous_day_hours': group.get('previous_day_hours', []),
+            'templates': [ProductName.short(center.upper(), group['type'], None)
+                          for center in group['centers'] if self.center_enabled(center)]
+        }
+    
+    def released(self, block, day, hours, now):
+        """Candidats d'un bloc pour une journée, limités à ceux déjà publiés"""
+        products = []
+        for h in hours:
+            start = day + timedelta(hours=h)
+            products.extend(p for p in (t._replace(start=start) for t in block['templates'])
+                            if self.schedule.released(p, now))
+        return products
+    
+    def generate(self, product_type, date_obj, use_new_format, now):
+        """Noms de fichiers candidats par ordre de priorité (now : heure UTC)"""
+        compiled = self.compiled.get(product_type)
+        if compiled is None:
+            return []
+        
+        day = datetime(date_obj.year, date_obj.month, date_obj.day)
+        blocks = compiled['long'] + compiled['short'] if use_new_format else compiled['legacy']
+        
+        filenames = []
+        for block in blocks:
+            products = self.released(block, day, block['issue_hours'], now)
+            if not products and block['previous_day_hours']:
+                # Rien de publié ce jour : dernières émissions de la veille
+                products = self.released(block, day - timedelta(days=1),
+                                         block['previous_day_hours'], now)
+            filenames.extend(p.filename() for p in products)
+        return filenames
+
+class ExpiringJsonCache:
+    """Cache persistant clé/valeur avec expiration, stocké en JSON"""
+    
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self.lock = threading.Lock()
+        self.entries = self.load()
+        # Clés modifiées depuis la dernière sauvegarde (prioritaires lors de la fusion)
+        self.dirty = set()
+    
+    def load(self):
+        """Charge le cache depuis le disque"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Cache illisible {self.cache_file.name}: {e}")
+        return {}
+    
+    def save(self):
+        """
+        Sauvegarde le cache (écriture atomique)
+        Sous verrou inter-processus, le fichier est relu et fusionné : les entrées écrites
+        par un autre processus sont conservées, celles modifiées ici l'emportent
+        """
+        temp_file = None
+        try:
+            with self.lock, FileLock(self.cache_file.with_name(self.cache_file.name + '.lock')):
+                merged = self.load()
+                for key in self.dirty:
+                    if key in self.entries:
+                        merged[key] = self.entries[key]
+                self.entries = merged
+                self.dirty.clear()
+                self.purge_expired()
+                
+                # Fichier temporaire unique : deux écritures concurrentes ne se mélangent pas
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_file.parent,
+                                                 prefix=self.cache_file.name + '.', suffix='.tmp',
+                                                 delete=False) as f:
+                    temp_file = f.name
+                    json.dump(self.entries, f, ensure_ascii=False)
+                os.replace(temp_file, self.cache_file)
+            return True
+        except Exception as e:
+            logger.warning(f"Erreur sauvegarde cache {self.cache_file.name}: {e}")
+            if temp_file and os.path.exists(temp_file):
+                os.unlink(temp_file)
+            return False
+    
+    def purge_expired(self):
+        """Supprime les entrées expirées"""
+        now = time.time()
+        expired = [key for key, entry in self.entries.items()
+                   if entry.get('expires') is not None and entry['expires'] <= now]
+        for key in expired:
+            del self.entries[key]
+    
+    def get(self, key):
+        """Retourne la valeur associée à la clé, ou None si absente ou expirée"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry.get('expires') is not None and entry['expires'] <= time.time():
+                del self.entries[key]
+                return None
+            return entry['value']
+    
+    def set(self, key, value, ttl_seconds=None):
+        """Enregistre une valeur (ttl_seconds=None : pas d'expiration)"""
+        with self.lock:
+            self.entries[key] = {
+                'value': value,
+                'expires': None if ttl_seconds is None else time.time() + ttl_seconds
+            }
+            self.dirty.add(key)
+
+class LatencyTracker:
+    """
+    Estimation de la latence réseau (lissage à la Jacobson/Karels)
+    Les délais d'attente s'adaptent aux temps de réponse observés, bornés par la configuration
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.srtt = None
+        self.rttvar = None
+    
+    def observe(self, seconds):
+        """Enregistre le temps de réponse (en-têtes reçus) d'une requête"""
+        with self.lock:
+            if self.srtt is None:
+                self.srtt = seconds
+                self.rttvar = seconds / 2
+            else:
+                self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - seconds)
+                self.srtt = 0.875 * self.srtt + 0.125 * seconds
+    
+    def timeout(self, minimum, maximum, factor=1.0):
+        """Délai d'attente adapté : srtt + 4*rttvar, borné à [minimum, maximum]"""
+        with self.lock:
+            if self.srtt is None:
+                return maximum
+            rto = (self.srtt + 4 * self.rttvar) * factor
+        return max(minimum, min(maximum, rto))
+
+class Mirror(namedtuple('Mirror', 'name base layout auth')):
+    """Miroir de produits : URL de base et gabarit du répertoire d'une semaine GPS"""
+    
+    __slots__ = ()
+    
+    def repository(self, gps_week):
+        return self.layout.format(base=self.base.rstrip('/'), week=gps_week)
+    
+    def serves(self, url):
+        return url.startswith(self.base.rstrip('/') + '/')
+
+class MirrorUnavailable(Exception):
+    """Miroir injoignable (ou sans réponse exploitable) pendant la découverte"""
+
+class MirrorSet:
+    """
+    Miroirs configurés, classés par débit récent mesuré (statistiques persistantes)
+    Les miroirs sains passent en tête, puis ceux sans mesure, puis ceux en échec
+    """
+    
+    def __init__(self, mirrors, stats_file, stats_ttl_days=7):
+        self.mirrors = [Mirror(m['name'], m['base'], m.get('layout', '{base}/{week:04d}/'), bool(m.get('auth')))
+                        for m in mirrors if m.get('enabled', True)]
+        self.stats = ExpiringJsonCache(stats_file)
+        self.stats_ttl = float(stats_ttl_days) * 86400
+        self.lock = threading.Lock()
+    
+    def throughput(self, mirror):
+        return (self.stats.get(mirror.name) or {}).get('throughput')
+    
+    def ordered(self):
+        """
+        Miroirs mesurés sains par débit décroissant, puis sans mesure (ordre de la configuration),
+        puis ceux dont le dernier accès a échoué : un miroir mort ne reste pas en tête
+        """
+        stats = {m.name: self.stats.get(m.name) or {} for m in self.mirrors}
+        
+        def rank(mirror):
+            entry = stats[mirror.name]
+            if entry.get('throughput') is None:
+                return (1, 0.0)
+            return (2 if entry.get('failed') else 0, -entry['throughput'])
+        
+        return sorted(self.mirrors, key=rank)
+    
+    def mirror_for(self, url):
+        return next((m for m in self.mirrors if m.serves(url)), None)
+    
+    def urls(self, filename, gps_week, preferred=None):
+        """URLs d'un produit sur chaque miroir, la préférée d'abord"""
+        urls = [m.repository(gps_week) + filename for m in self.ordered()]
+        if preferred:
+            urls = [preferred] + [u for u in urls if u != preferred]
+        return urls
+    
+    def auth_hosts(self):
+        """Hôtes autorisés à recevoir le jeton JWT"""
+        return {urlparse(m.base).hostname for m in self.mirrors if m.auth}
+    
+    def record_transfer(self, url, nbytes, seconds):
+        """Débit observé (octets/s, moyenne exponentielle)"""
+        mirror = self.mirror_for(url)
+        if mirror is None or seconds <= 0 or nbytes <= 0:
+            return
+        with self.lock:
+            previous = self.throughput(mirror)
+            rate = nbytes / seconds
+            rate = rate if previous is None else 0.7 * previous + 0.3 * rate
+            self.stats.set(mirror.name, {'throughput': rate}, self.stats_ttl)
+    
+    def record_failure(self, url):
+        """Échec de transfert ou de découverte : le débit retenu est divisé par deux"""
+        mirror = self.mirror_for(url)
+        if mirror is None:
+            return
+        with self.lock:
+            previous = self.throughput(mirror)
+            self.stats.set(mirror.name, {'throughput': (previous or 2.0) / 2, 'failed': True}, self.stats_ttl)
+    
+    def save(self):
+        return self.stats.save()
+
+class BearerTokenAuth(AuthBase):
+    """Jeton JWT envoyé uniquement aux hôtes des miroirs qui l'exigent"""
+    
+    def __init__(self, token, hosts):
+        self.token = token
+        self.hosts = set(hosts)
+    
+    def __call__(self, request):
+        if self.token and urlparse(request.url).hostname in self.hosts:
+            request.headers['Authorization'] = f'Bearer {self.token}'
+        return request
+
+class CenterScoreboard:
+    """
+    Tableau de bord persistant par centre et type de produit :
+    taux de succès des sondes, latences HEAD/GET et délai de publication observé (Last-Modified)
+    Sert à réordonner les candidats de même préférence pour que la première sonde aboutisse
+    """
+    
+    def __init__(self, scoreboard_file):
+        self.entries = ExpiringJsonCache(scoreboard_file)
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def key(product):
+        return f"{product.center}:{product.product_type}:{product.sampling or ''}"
+    
+    def stats(self, product):
+        stats = self.entries.get(self.key(product)) or {
+            'hits': 0, 'misses': 0, 'head': None, 'get': None, 'release': None}
+        # Ancien champ : âge au téléchargement, faussé par les produits d'archive
+        stats.pop('delay', None)
+        stats.setdefault('release', None)
+        return stats
+    
+    def update(self, product, **changes):
+        """Mise à jour d'une entrée ; latences et délai de publication lissés (moyenne exponentielle)"""
+        with self.lock:
+            stats = self.stats(product)
+            for field, value in changes.items():
+                if field in ('hits', 'misses'):
+                    stats[field] += value
+                else:
+                    stats[field] = value if stats[field] is None else 0.8 * stats[field] + 0.2 * value
+            self.entries.set(self.key(product), stats)
+    
+    def record_probe(self, filename, found, seconds=None):
+        """Résultat d'une sonde HEAD ou d'une consultation de listing"""
+        product = ProductName.parse(filename)
+        if product is None:
+            return
+        changes = {'hits' if found else 'misses': 1}
+        if seconds is not None:
+            changes['head'] = seconds
+        self.update(product, **changes)
+    
+    def record_transfer(self, filename, seconds, now, published=None):
+        """
+        Transfert réussi : durée GET et, pour un produit récent dont la date de mise en ligne
+        est connue (Last-Modified), délai de publication constaté
+        """
+        product = ProductName.parse(filename)
+        if product is None:
+            return
+        changes = {'get': seconds}
+        age_hours = (now - product.start).total_seconds() / 3600
+        if published is not None and age_hours <= RELEASE_OBSERVATION_HOURS:
+            changes['release'] = max(0.0, (published - product.start).total_seconds() / 3600)
+        self.update(product, **changes)
+    
+    def expected_cost(self, product, now):
+        """Coût attendu avant succès : latence HEAD / probabilité de présence"""
+        stats = self.stats(product)
+        # Estimateur de Laplace : un centre inconnu vaut 1/2
+        hit_rate = (stats['hits'] + 1) / (stats['hits'] + stats['misses'] + 2)
+        if stats['release']:
+            # Produit plus jeune que le délai de publication constaté pour ce centre : présence moins probable
+            age_hours = (now - product.start).total_seconds() / 3600
+            hit_rate *= max(0.05, min(1.0, age_hours / stats['release']))
+        return (stats['head'] or 1.0) / hit_rate
+    
+    def reorder(self, filenames, now):
+        """
+        Réordonne les suites de candidats de même préférence (même produit, centres différents)
+        Le tri est stable : sans historique, l'ordre du catalogue est conservé
+        """
+        ordered = []
+        run = []
+        run_key = None
+        for filename in filenames + [None]:
+            product = ProductName.parse(filename) if filename else None
+            preference = (product._replace(center=None, campaign=None, version=None)
+                          if product else filename)
+            if run and (preference != run_key or product is None):
+                run.sort(key=lambda item: self.expected_cost(item[1], now))
+                ordered.extend(name for name, _ in run)
+                run = []
+            if product is None:
+                if filename is not None:
+                    ordered.append(filename)
+                continue
+            run.append((filename, product))
+            run_key = preference
+        return ordered
+    
+    def save(self):
+        return self.entries.save()
+
+class ProductStore:
+    """
+    Magasin local de produits adressé par contenu (SHA-512), indexé par nom de produit
+    Les fichiers des répertoires de sortie sont des liens physiques vers les objets du magasin
+    """
+    
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index = ExpiringJsonCache(self.store_dir / "index.json")
+    
+    @staticmethod
+    def hash_file(path):
+        """Empreinte SHA-512 d'un fichier"""
+        hasher = hashlib.sha512()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def link_or_copy(source, target):
+        """Remplace target par un lien physique vers source (copie si le lien est impossible)"""
+        target = Path(target)
+        temp = target.with_name(target.name + '.tmp')
+        if temp.exists():
+            temp.unlink()
+        try:
+            os.link(source, temp)
+        except OSError:
+            # Autre volume ou système de fichiers sans liens physiques
+            shutil.copy2(source, temp)
+        os.replace(temp, target)
+    
+    def object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+    
+    def lookup(self, product_name):
+        """Entrée du magasin pour un nom de produit, ou None"""
+        entry = self.index.get(product_name)
+        if entry and self.object_path(entry['sha512']).exists():
+            return entry
+        return None
+    
+    def materialize(self, entry, output_dir):
+        """Rend le produit disponible dans output_dir et retourne son chemin"""
+        target = Path(output_dir) / entry['file']
+        source = self.object_path(entry['sha512'])
+        
+        if target.exists() and target.stat().st_size == entry['size']:
+            return target
+        
+        self.link_or_copy(source, target)
+        return target
+    
+    def add(self, product_name, path):
+        """Ajoute un fichier au magasin ; un contenu déjà connu est dédupliqué par lien"""
+        path = Path(path)
+        digest = self.hash_file(path)
+        object_path = self.object_path(digest)
+        
+        if object_path.exists():
+            if not os.path.samefile(object_path, path):
+                self.link_or_copy(object_path, path)
+        else:
+            object_path.parent.mkdir(exist_ok=True)
+            self.link_or_copy(path, object_path)
+        
+        self.index.set(product_name, {
+            'sha512': digest,
+            'size': path.stat().st_size,
+            'file': path.name
+        })
+        self.index.save()
+        return digest
+
+class ProductCatalog:
+    """Catalogue SQLite des produits téléchargés, avec requêtes indexées"""
+    
+    COLUMNS = ('path', 'name', 'center', 'campaign', 'product_type', 'gps_week', 'start_epoch',
+               'span', 'sampling', 'size', 'sha512', 'n_satellites', 'constellations',
+               'time_system', 'agency', 'n_epochs', 'downloaded_at', 'published_at')
+    
+    def __init__(self, db_file):
+        self.db_file = Path(db_file)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.create_schema()
+    
+    def create_schema(self):
+        with self.lock, self.connection:
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS products (
+                    path TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    center TEXT,
+                    campaign TEXT,
+                    product_type TEXT,
+                    gps_week INTEGER,
+                    start_epoch INTEGER,
+                    span TEXT,
+                    sampling TEXT,
+                    size INTEGER,
+                    sha512 TEXT,
+                    n_satellites INTEGER,
+                    constellations TEXT,
+                    time_system TEXT,
+                    agency TEXT,
+                    n_epochs INTEGER,
+                    downloaded_at REAL,
+                    published_at REAL
+                )''')
+            # Catalogues antérieurs : date de mise en ligne ajoutée après coup
+            columns = {row['name'] for row in self.connection.execute("PRAGMA table_info(products)")}
+            if 'published_at' not in columns:
+                self.connection.execute("ALTER TABLE products ADD COLUMN published_at REAL")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_products_lookup "
+                "ON products (center, product_type, gps_week, sampling)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_products_start ON products (start_epoch)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_products_name ON products (name)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_products_sha512 ON products (sha512)")
+    
+    def contains(self, path):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM products WHERE path = ?", (str(path),)).fetchone()
+        return row is not None
+    
+    def entry(self, path):
+        """Enregistrement d'un produit par chemin, ou None"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM products WHERE path = ?", (str(path),)).fetchone()
+        return dict(row) if row else None
+    
+    def record(self, product_name, path, sha512=None, published=None):
+        """
+        Enregistre (ou met à jour) un produit téléchargé
+        published : date de mise en ligne annoncée par le serveur (Last-Modified), si connue
+        """
+        path = Path(path)
+        product = ProductName.parse(product_name)
+        header = read_sp3_header(path)
+        constellations = ''.join(sorted({sat[0] for sat in header['satellites']}))
+        
+        row = {
+            'path': str(path),
+            'name': product_name,
+            'center': product.center if product else None,
+            'campaign': product.campaign if product else None,
+            'product_type': product.product_type if product else None,
+            'gps_week': product.gps_week if product else None,
+            'start_epoch': product.start_epoch if product else None,
+            'span': product.period if product else None,
+            'sampling': product.sampling if product else None,
+            'size': path.stat().st_size,
+            'sha512': sha512,
+            'n_satellites': len(header['satellites']),
+            'constellations': constellations,
+            'time_system': header['time_system'],
+            'agency': header['agency'],
+            'n_epochs': header['n_epochs'],
+            'downloaded_at': time.time(),
+            'published_at': published.replace(tzinfo=timezone.utc).timestamp() if published else None
+        }
+        
+        placeholders = ', '.join('?' for _ in self.COLUMNS)
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO products ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                [row[c] for c in self.COLUMNS])
+    
+    def publication_latencies(self, recent=20):
+        """
+        Latence de publication constatée (en heures) par centre et type : quartile supérieur
+        des derniers produits récents au téléchargement, datés par Last-Modified
+        """
+        gps_epoch_unix = (GPS_EPOCH - datetime(1970, 1, 1)).total_seconds()
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT center, product_type, published_at - start_epoch - ? AS latency "
+                "FROM products WHERE center IS NOT NULL AND product_type IS NOT NULL "
+                "AND start_epoch IS NOT NULL AND published_at IS NOT NULL "
+                "AND downloaded_at - start_epoch - ? <= ? ORDER BY downloaded_at DESC",
+                (gps_epoch_unix, gps_epoch_unix, RELEASE_OBSERVATION_HOURS * 3600)).fetchall()
+        
+        samples = {}
+        for r in rows:
+            latencies = samples.setdefault((r['center'], r['product_type']), [])
+            if len(latencies) < recent:
+                latencies.append(max(0.0, r['latency'] / 3600))
+        return {key: sorted(latencies)[(3 * (len(latencies) - 1)) // 4] for key, latencies in samples.items()}
+    
+    def query(self, center=None, campaign=None, product_type=None, gps_week=None, sampling=None,
+              start=None, end=None, limit=None):
+        """
+        Recherche des produits par critères (tous optionnels)
+        start/end : bornes (datetime) sur l'époque de début du produit
+        """
+        clauses = []
+        params = []
+        for column, value in (('center', center), ('campaign', campaign),
+                              ('product_type', product_type), ('gps_week', gps_week),
+                              ('sampling', sampling)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value.upper() if column in ('center', 'campaign', 'sampling') else value)
+        if start is not None:
+            clauses.append("start_epoch >= ?")
+            params.append(int((start - GPS_EPOCH).total_seconds()))
+        if end is not None:
+            clauses.append("start_epoch < ?")
+            params.append(int((end - GPS_EPOCH).total_seconds()))
+        
+        sql = "SELECT * FROM products"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start_epoch, center"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        
+        with self.lock:
+            return [dict(r) for r in self.connection.execute(sql, params).fetchall()]
+
+class SingleFlight:
+    """
+    Regroupement des appels concurrents de même clé : le premier s'exécute,
+    les suivants attendent et partagent son résultat (ou son exception)
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+    
+    def do(self, key, function, *args):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = function(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+    
+    def in_flight(self, key):
+        with self.lock:
+            return key in self.calls
+
+class FileLock:
+    """Verrou exclusif inter-processus sur un fichier (msvcrt sous Windows, fcntl ailleurs)"""
+    
+    def __init__(self, lock_path):
+        self.lock_path = Path(lock_path)
+        self.handle = None
+    
+    def acquire(self, blocking=True):
+        """Prend le verrou ; retourne False s'il est déjà tenu et que blocking est faux"""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_path, 'a+b')
+        try:
+            if os.name == 'nt':
+                handle.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+                        time.sleep(0.5)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except OSError:
+            handle.close()
+            return False
+        self.handle = handle
+        return True
+    
+    def release(self):
+        if self.handle is None:
+            return
+        try:
+            if os.name == 'nt':
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.handle.close()
+            self.handle = None
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+
+class PartFileSink:
+    """Destination d'un transfert : fichier .part brut, reprenable entre deux exécutions"""
+    
+    def __init__(self, part_path):
+        self.part_path = Path(part_path)
+        self.hasher = hashlib.sha512()
+        
+        # Reprise d'un .part existant : son contenu doit entrer dans l'empreinte
+        if self.part_path.exists():
+            with open(self.part_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    self.hasher.update(block)
+        
+        self.file = open(self.part_path, 'ab')
+        self.size = self.file.tell()
+        # Taille annoncée par le serveur, connue une fois le transfert validé
+        self.total = None
+    
+    def write(self, chunk):
+        self.file.write(chunk)
+        self.hasher.update(chunk)
+        self.size += len(chunk)
+    
+    def reset(self):
+        """Repart de zéro (serveur sans support Range ou données incohérentes)"""
+        self.file.seek(0)
+        self.file.truncate()
+        self.hasher = hashlib.sha512()
+        self.size = 0
+    
+    def finish(self):
+        self.close()
+    
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+class SegmentHasher:
+    """
+    Empreinte SHA-512 d'un fichier reçu par plages parallèles, calculée sur les octets reçus
+    Les blocs en avance sur le préfixe contigu restent en mémoire jusqu'à ce qu'il les rejoigne ;
+    seules les plages déjà sur disque (reprise d'une exécution précédente) y sont relues
+    """
+    
+    def __init__(self, path, on_disk=None):
+        self.path = Path(path)
+        self.hasher = hashlib.sha512()
+        self.offset = 0
+        self.pending = {}
+        # {début: fin exclue} des octets écrits lors d'une exécution précédente
+        self.on_disk = dict(on_disk or {})
+        self.lock = threading.Lock()
+        with self.lock:
+            self.drain()
+    
+    def update(self, offset, data):
+        with self.lock:
+            if offset == self.offset:
+                self.hasher.update(data)
+                self.offset += len(data)
+                self.drain()
+            elif offset > self.offset:
+                self.pending[offset] = data
+    
+    def drain(self):
+        while True:
+            if self.offset in self.pending:
+                data = self.pending.pop(self.offset)
+                self.hasher.update(data)
+                self.offset += len(data)
+            elif self.offset in self.on_disk:
+                end = self.on_disk.pop(self.offset)
+                with open(self.path, 'rb') as f:
+                    f.seek(self.offset)
+                    while self.offset < end:
+                        block = f.read(min(end - self.offset, 1024 * 1024))
+                        if not block:
+                            raise ValueError("fichier segmenté plus court que prévu")
+                        self.hasher.update(block)
+                        self.offset += len(block)
+            else:
+                return
+    
+    def hexdigest(self):
+        return self.hasher.hexdigest()
+
+class GzipStreamDecoder:
+    """Décompression gzip incrémentale, fichiers multi-membres inclus"""
+    
+    def __init__(self):
+        self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    
+    def decompress(self, data):
+        output = []
+        while data:
+            output.append(self.decompressor.decompress(data))
+            if not self.decompressor.eof:
+                break
+            # Membre terminé : le suivant éventuel commence dans unused_data
+            data = self.decompressor.unused_data
+            if data.strip(b'\x00'):
+                self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            else:
+                break
+        return b''.join(output)
+    
+    def flush(self):
+        return self.decompressor.flush()
+    
+    @property
+    def complete(self):
+        return self.decompressor.eof
+
+class UnixZError(ValueError):
+    """Flux Unix compress (.Z) invalide"""
+
+class UnixZDecoder:
+    """
+    Décompression LZW (.Z, Unix compress) incrémentale en pur Python
+    Reproduit le format de ncompress, y compris l'alignement des codes par groupes de 8
+    lors d'un changement de largeur ou d'un code CLEAR
+    """
+    
+    CLEAR = 256
+    
+    def __init__(self):
+        self.buffer = bytearray()
+        self.bitpos = 0
+        self.maxbits = None
+        self.block_mode = False
+        self.maxmaxcode = 0
+        self.n_bits = 9
+        self.maxcode = (1 << 9) - 1
+        self.group_count = 0
+        self.table = [bytes([i]) for i in range(256)]
+        self.prev = None
+    
+    def read_header(self):
+        if len(self.buffer) < 3:
+            return False
+        if self.buffer[0] != 0x1f or self.buffer[1] != 0x9d:
+            raise UnixZError("en-tête .Z invalide")
+        
+        flags = self.buffer[2]
+        self.maxbits = flags & 0x1f
+        self.block_mode = bool(flags & 0x80)
+        if not 9 <= self.maxbits <= 16:
+            raise UnixZError(f"largeur de code non supportée: {self.maxbits} bits")
+        
+        self.maxmaxcode = 1 << self.maxbits
+        if self.block_mode:
+            # Emplacement réservé au code CLEAR
+            self.table.append(b'')
+        del self.buffer[:3]
+        return True
+    
+    def decompress(self, data):
+        self.buffer += data
+        if self.maxbits is None and not self.read_header():
+            return b''
+        
+        # Variables locales : la boucle par code est le point chaud
+        buf = bytes(self.buffer) + b'\x00\x00\x00'
+        avail = len(self.buffer) * 8
+        pos = self.bitpos
+        n_bits = self.n_bits
+        mask = (1 << n_bits) - 1
+        maxcode = self.maxcode
+        maxmaxcode = self.maxmaxcode
+        block_mode = self.block_mode
+        count = self.group_count
+        table = self.table
+        prev = self.prev
+        out = []
+        
+        while True:
+            if len(table) > maxcode:
+                # Nouvelle largeur : les codes restants du groupe courant sont ignorés
+                pos += ((8 - count % 8) % 8) * n_bits
+                count = 0
+                n_bits += 1
+                maxcode = maxmaxcode if n_bits == self.maxbits else (1 << n_bits) - 1
+                mask = (1 << n_bits) - 1
+            
+            if pos + n_bits > avail:
+                break
+            
+            i = pos >> 3
+            code = ((buf[i] | buf[i + 1] << 8 | buf[i + 2] << 16) >> (pos & 7)) & mask
+            pos += n_bits
+            count += 1
+            
+            if prev is None:
+                if code >= 256:
+                    raise UnixZError("premier code invalide")
+                prev = table[code]
+                out.append(prev)
+                continue
+            
+            if code == self.CLEAR and block_mode:
+                del table[256:]
+                pos += ((8 - count % 8) % 8) * n_bits
+                count = 0
+                n_bits = 9
+                maxcode = (1 << 9) - 1
+                mask = maxcode
+                continue
+            
+            if code < len(table):
+                entry = table[code]
+            elif code == len(table):
+                entry = prev + prev[:1]
+            else:
+                raise UnixZError("code hors table")
+            
+            out.append(entry)
+            if len(table) < maxmaxcode:
+                table.append(prev + entry[:1])
+            prev = entry
+        
+        consumed = min(pos >> 3, len(self.buffer))
+        del self.buffer[:consumed]
+        self.bitpos = pos - consumed * 8
+        self.n_bits = n_bits
+        self.maxcode = maxcode
+        self.group_count = count
+        self.prev = prev
+        return b''.join(out)
+    
+    def flush(self):
+        return b''
+    
+
+class DecompressingSink:
+    """
+    Destination d'un transfert décompressé à la volée : le produit est écrit en une passe
+    Le flux compressé n'est recopié sur disque que si compressed_part_path est fourni ;
+    sans copie, la reprise se fait dans l'exécution courante (état du décodeur en mémoire)
+    """
+    
+    def __init__(self, decoder_factory, output_part_path, compressed_part_path=None):
+        self.decoder_factory = decoder_factory
+        self.output_part_path = Path(output_part_path)
+        self.compressed_part_path = Path(compressed_part_path) if compressed_part_path else None
+        
+        self.output_file = open(self.output_part_path, 'wb')
+        self.compressed_file = open(self.compressed_part_path, 'ab') if self.compressed_part_path else None
+        self.decoder = decoder_factory()
+        self.hasher = hashlib.sha512()
+        self.size = 0
+        self.total = None
+        
+        # L'état du décodeur n'est pas persistant : le .part compressé d'une exécution
+        # précédente est rejoué dans le décodeur avant de reprendre par Range
+        if self.compressed_file and self.compressed_file.tell():
+            try:
+                with open(self.compressed_part_path, 'rb') as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        self.decode(block)
+            except Exception as e:
+                logger.warning(f"Reprise impossible {self.compressed_part_path.name}: {str(e)}")
+                self.reset()
+    
+    def decode(self, chunk):
+        self.hasher.update(chunk)
+        self.output_file.write(self.decoder.decompress(chunk))
+        self.size += len(chunk)
+    
+    def write(self, chunk):
+        if self.compressed_file:
+            self.compressed_file.write(chunk)
+        self.decode(chunk)
+    
+    def reset(self):
+        for f in (self.output_file, self.compressed_file):
+            if f:
+                f.seek(0)
+                f.truncate()
+        self.decoder = self.decoder_factory()
+        self.hasher = hashlib.sha512()
+        self.size = 0
+    
+    def finish(self):
+        """Vide le décodeur et vérifie que le flux compressé est complet (gzip uniquement)"""
+        self.output_file.write(self.decoder.flush())
+        self.close()
+        # Le format .Z n'a pas de marqueur de fin : seules la taille annoncée et l'empreinte
+        # permettent de détecter une troncature
+        if getattr(self.decoder, 'complete', True) is False:
+            raise ValueError("flux compressé tronqué")
+    
+    @property
+    def verified(self):
+        """Flux attesté complet : taille annoncée atteinte ou marqueur de fin du format"""
+        return self.total is not None or getattr(self.decoder, 'complete', False)
+    
+    def close(self):
+        for f in (self.output_file, self.compressed_file):
+            if f and not f.closed:
+                f.close()
+
 class SP3CombinedDownloader:
     """Téléchargeur SP3 intelligent pour produits combinés GPS/GLONASS avec configuration"""
     
@@ -101,26 +1838,51 @@ class SP3CombinedDownloader:
         self.output_dir = Path(self.config.get('output_directory'))
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Session avec authentification
+        # Session partagée (le jeton JWT est ajouté par miroir, voir open_mirrors)
         self.session = requests.Session()
         self.session.headers.update({
-            'Authorization': f'Bearer {self.config.get("jwt_token")}',
             'User-Agent': 'SP3-Combined-Downloader/2.2'
         })
+        self.latency = LatencyTracker()
+        self.configure_transport()
         
-        # URLs de base CDDIS (MGEX supprimé)
-        self.cddis_base = "https://cddis.nasa.gov/archive/gnss/products"
-        self.broadcast_base = "https://cddis.nasa.gov/archive/gnss/data/daily"
+        # Octets reçus du réseau (partagé entre les workers)
+        self.bytes_received = 0
+        # Dates de mise en ligne (Last-Modified) vues pendant la découverte et les transferts
+        self.published = {}
+        # Tailles des produits connues par le listing ou les sondes HEAD
+        self.known_sizes = {}
+        self.stats_lock = threading.Lock()
         
-        # Seuils de disponibilité des produits IGS (en heures)
-        self.availability_thresholds = {
-            'final': 12 * 24,      # 12 jours minimum
-            'rapid': 24,           # 1 jour minimum  
-            'ultra_rapid': 3       # 3 heures minimum
-        }
+        # Demandes simultanées d'un même jour ou d'un même fichier : un seul téléchargement
+        self.inflight = SingleFlight()
         
-        # Intervalles de temps par ordre de priorité
-        self.time_intervals = ['01S', '30S', '05M', '15M']
+        # Cache des listings de répertoires (à côté de sp3_config.json)
+        self.listing_cache = ExpiringJsonCache(self.config.config_dir / "sp3_listing_cache.json")
+        # Manifestes SHA512SUMS par semaine GPS
+        self.checksum_cache = ExpiringJsonCache(self.config.config_dir / "sp3_checksum_cache.json")
+        # Cache négatif des candidats absents (404), par URL complète
+        self.negative_cache = ExpiringJsonCache(self.config.config_dir / "sp3_negative_cache.json")
+        # Tableau de bord des centres (succès, latences, délais de publication)
+        self.scoreboard = CenterScoreboard(self.config.config_dir / "sp3_scoreboard.json")
+        
+        # Magasin local de produits (résolution sans réseau)
+        self.open_store()
+        
+        # Catalogue SQLite des produits téléchargés
+        self.catalog = None
+        if self.config.get('use_catalog'):
+            try:
+                self.catalog = ProductCatalog(self.config.config_dir / "sp3_catalog.db")
+            except Exception as e:
+                logger.warning(f"Catalogue indisponible: {str(e)}")
+        
+        # Miroirs des produits (CDDIS, IGN, BKG, local...) classés par débit
+        self.open_mirrors()
+        self.broadcast_base = "https://cddis.nasa.gov/archive/gnss/data/daily"
+        
+        # Générateur de candidats et seuils de disponibilité (modèle de publication)
+        self.compile_candidates()
         
         # Précisions et caractéristiques des produits
         self.product_specs = {
@@ -150,10 +1912,93 @@ class SP3CombinedDownloader:
         self.output_dir = Path(self.config.get('output_directory'))
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Mettre à jour l'authentification
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.config.get("jwt_token")}'
-        })
+        # Mettre à jour les miroirs et l'authentification
+        self.open_mirrors()
+        self.configure_transport()
+        self.open_store()
+        self.compile_candidates()
+    
+    def compile_candidates(self):
+        """Compile le catalogue des produits en générateur de candidats"""
+        observed = {}
+        if self.catalog:
+            try:
+                observed = self.catalog.publication_latencies()
+            except Exception as e:
+                logger.warning(f"Historique de publication illisible: {str(e)}")
+        self.schedule = PublicationSchedule(self.config.products, observed)
+        self.candidates = CandidateGenerator(self.config.products, self.config.get('enabled_centers'),
+                                             self.schedule)
+        
+        # Seuils de disponibilité des produits (en heures depuis le début du jour, UTC)
+        self.availability_thresholds = {product_type: self.schedule.earliest(product_type)
+                                        for product_type in ('final', 'rapid', 'ultra_rapid')}
+        # Intervalles de temps par ordre de priorité
+        self.time_intervals = self.candidates.time_intervals
+    
+    def open_mirrors(self):
+        """Charge la liste des miroirs et limite l'envoi du jeton JWT aux miroirs authentifiés"""
+        self.mirrors = MirrorSet(self.config.get('mirrors'), self.config.config_dir / "sp3_mirrors.json",
+                                 self.config.get('mirror_stats_ttl_days'))
+        self.session.auth = BearerTokenAuth(self.config.get('jwt_token'), self.mirrors.auth_hosts())
+    
+    def open_store(self):
+        """Ouvre le magasin local de produits s'il est activé"""
+        self.store = None
+        if self.config.get('use_product_store'):
+            store_dir = self.config.get('store_directory') or self.config.config_dir / "SP3_Store"
+            try:
+                self.store = ProductStore(store_dir)
+            except Exception as e:
+                logger.warning(f"Magasin local indisponible: {str(e)}")
+    
+    def configure_transport(self):
+        """
+        Configure le pool de connexions et les reprises de la session partagée
+        Pool dimensionné sur le nombre de workers, reprises exponentielles avec gigue sur 5xx
+        """
+        pool_maxsize = int(self.config.get('pool_maxsize') or 0)
+        if pool_maxsize <= 0:
+            # Automatique : chaque worker groupé peut sonder les 3 niveaux en parallèle
+            bulk_workers = max(1, int(self.config.get('bulk_workers') or 1))
+            probe_workers = max(1, int(self.config.get('probe_workers') or 1))
+            pool_maxsize = max(10, bulk_workers * 3 * probe_workers)
+        
+        retry_options = dict(
+            total=int(self.config.get('max_retries')),
+            backoff_factor=float(self.config.get('backoff_factor')),
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['HEAD', 'GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        try:
+            retries = Retry(backoff_jitter=float(self.config.get('backoff_jitter')), **retry_options)
+        except TypeError:
+            # urllib3 < 2 : pas de gigue intégrée
+            retries = Retry(**retry_options)
+        
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def head_timeout(self):
+        """Délai d'attente adaptatif des requêtes HEAD"""
+        return self.latency.timeout(float(self.config.get('min_timeout')),
+                                    float(self.config.get('head_timeout')))
+    
+    def get_timeout(self):
+        """Délai d'attente adaptatif (connexion, lecture) des requêtes GET"""
+        connect = self.head_timeout()
+        read = self.latency.timeout(float(self.config.get('min_read_timeout')),
+                                    float(self.config.get('get_timeout')), factor=8)
+        return connect, read
+    
+    def backoff_delay(self, attempt):
+        """Attente exponentielle avec gigue avant la reprise n° attempt"""
+        base = float(self.config.get('backoff_factor')) * (2 ** (attempt - 1))
+        jitter = random.uniform(0, float(self.config.get('backoff_jitter')))
+        return min(base + jitter, 30)
         
     def gps_epoch(self):
         """Époque GPS : 6 janvier 1980 00:00:00 UTC"""
@@ -186,7 +2031,7 @@ class SP3CombinedDownloader:
         else:
             date_obj = target_date
         
-        now = datetime.now()
+        now = utc_now()
         time_diff = now - date_obj
         hours_elapsed = time_diff.total_seconds() / 3600
         
@@ -211,200 +2056,475 @@ class SP3CombinedDownloader:
     def generate_combined_sp3_filenames(self, target_date, product_type):
         """
         Génère les noms de fichiers SP3 avec priorité aux intervalles de temps
-        Version modifiée pour nomenclature ultra-rapides et intervalles prioritaires
+        Les candidats proviennent du catalogue des produits (sp3_products.json)
         """
         gps_week, day_of_week, date_obj = self.date_to_gps_week(target_date)
-        year = date_obj.year
-        doy = date_obj.timetuple().tm_yday
         
-        filenames = []
+        # Déterminer le format selon la semaine GPS (transition novembre 2022)
+        use_new_format = gps_week >= self.candidates.legacy_week
         
-        # Déterminer le format selon la semaine GPS
-        use_new_format = gps_week >= 2238  # Transition novembre 2022
-        
-        if use_new_format:
-            # Format moderne (depuis GPS Week 2238)
-            if product_type == 'final':
-                # PRODUITS FINAUX avec intervalles prioritaires
-                for interval in self.time_intervals:
-                    filenames.append(f"IGS0OPSFIN_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    filenames.append(f"COD0MGXFIN_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    filenames.append(f"GFZ0MGXFIN_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    filenames.append(f"WUM0MGXFIN_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    
-                    
-            elif product_type == 'rapid':
-                # PRODUITS RAPIDES avec intervalles prioritaires
-                for interval in self.time_intervals:
-                    filenames.append(f"IGS0OPSRAP_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    filenames.append(f"COD0OPSRAP_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    filenames.append(f"GFZ0OPSRAP_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    filenames.append(f"JPL0OPSRAP_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    filenames.append(f"IGR0OPSRAP_{year}{doy:03d}0000_01D_{interval}_ORB.SP3.gz")
-                    
-            elif product_type == 'ultra_rapid':
-                # PRODUITS ULTRA-RAPIDES - Format corrigé
-                now = datetime.now()
+        now = utc_now()
+        filenames = self.candidates.generate(product_type, date_obj, use_new_format, now)
+        
+        # Centres de même préférence : d'abord ceux qui répondent vite et publient tôt
+        if self.config.get('adaptive_ordering'):
+            filenames = self.scoreboard.reorder(filenames, now)
+        
+        return filenames, gps_week, use_new_format
+    
+    def parse_date(self, date_str):
+        """Convertit 'DD/MM/YYYY' ou 'YYYY-MM-DD' en datetime"""
+        if isinstance(date_str, datetime):
+            return date_str
+        if '/' in date_str:
+            return datetime.strptime(date_str, "%d/%m/%Y")
+        return datetime.strptime(date_str, "%Y-%m-%d")
+    
+    def expand_dates(self, start=None, end=None, dates=None, gps_weeks=None):
+        """
+        Construit la liste triée des dates à traiter
+        Accepte une période (start, end incluses), une liste de dates et/ou de semaines GPS
+        """
+        selected = set()
+        
+        if start is not None:
+            day = self.parse_date(start)
+            last = self.parse_date(end) if end is not None else day
+            while day <= last:
+                selected.add(day)
+                day += timedelta(days=1)
+        
+        for date_str in dates or []:
+            selected.add(self.parse_date(date_str))
+        
+        for gps_week in gps_weeks or []:
+            week_start = self.gps_epoch() + timedelta(weeks=int(gps_week))
+            for dow in range(7):
+                selected.add(week_start + timedelta(days=dow))
+        
+        return sorted(selected)
+    
+    def bulk_download(self, dates, workers=None):
+        """
+        Télécharge une série de dates avec un pool de workers borné
+        Tous les workers partagent la même session (et son pool de connexions)
+        Retourne la liste des résultats par date
+        """
+        workers = max(1, int(workers or self.config.get('bulk_workers') or 1))
+        dates = [self.parse_date(d) for d in dates]
+        
+        print(f"🚀 Téléchargement groupé: {len(dates)} dates, {workers} workers")
+        
+        def process(date_obj):
+            t0 = time.time()
+            path = self.smart_download_sp3(date_obj.strftime("%Y-%m-%d"))
+            return {
+                'date': date_obj.strftime("%Y-%m-%d"),
+                'path': path,
+                'size': Path(path).stat().st_size if path and Path(path).exists() else 0,
+                'elapsed': time.time() - t0
+            }
+        
+        start_bytes = self.bytes_received
+        start_time = time.time()
+        results = []
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(process, d): d for d in dates}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Erreur téléchargement groupé {futures[future]:%Y-%m-%d}: {str(e)}")
+                    results.append({'date': futures[future].strftime("%Y-%m-%d"),
+                                    'path': None, 'size': 0, 'elapsed': 0.0})
+        
+        results.sort(key=lambda r: r['date'])
+        elapsed = max(time.time() - start_time, 1e-6)
+        received = self.bytes_received - start_bytes
+        
+        print(f"\n📋 RÉSULTATS PAR DATE")
+        for r in results:
+            if r['path']:
+                print(f"   ✅ {r['date']}: {Path(r['path']).name} ({r['elapsed']:.1f}s)")
+            else:
+                print(f"   ❌ {r['date']}: aucun produit ({r['elapsed']:.1f}s)")
+        
+        succeeded = sum(1 for r in results if r['path'])
+        print(f"\n📊 {succeeded}/{len(results)} dates téléchargées en {elapsed:.1f}s")
+        print(f"📶 Débit réseau: {received / (1024*1024):.2f} MB reçus, "
+              f"{received / (1024*1024) / elapsed:.2f} MB/s, {len(results) / elapsed:.2f} dates/s")
+        
+        return results
+    
+    def fallback_tiers(self, optimal_product):
+        """Ordre de résolution : produit optimal puis replis automatiques"""
+        if optimal_product == 'ultra_rapid':
+            return ['ultra_rapid', 'rapid', 'final']
+        elif optimal_product == 'rapid':
+            return ['rapid', 'final']
+        return ['final']
+    
+    def smart_download_sp3(self, target_date):
+        """
+        Téléchargement intelligent avec sélection automatique du produit optimal
+        Les demandes simultanées pour un même jour partagent un seul téléchargement
+        """
+        try:
+            day = self.date_to_gps_week(target_date)[2].date()
+        except Exception as e:
+            logger.error(f"Erreur téléchargement: {str(e)}")
+            return None
+        
+        if self.inflight.in_flight(('date', day)):
+            print(f"⏳ {day} déjà en cours de téléchargement, résultat partagé")
+        return self.inflight.do(('date', day), self.download_best_product, target_date)
+    
+    def download_best_product(self, target_date):
+        """Sélection du produit optimal puis repli automatique sur les niveaux suivants"""
+        try:
+            availability = self.analyze_data_availability(target_date)
+            
+            if availability['data_unavailable']:
+                print(f"❌ Aucun produit disponible (minimum 3h requis)")
+                return None
+            
+            optimal_product = availability['optimal_product']
+            tiers = self.fallback_tiers(optimal_product)
+            
+            # Produit optimal déjà disponible localement : aucun accès réseau
+            filenames, _, _ = self.generate_combined_sp3_filenames(target_date, optimal_product)
+            cached = self.find_cached_product(filenames, current=True)
+            if cached:
+                print(f"✅ Succès {optimal_product.upper()} (local)")
+                return cached
+            
+            if self.config.get('parallel_tiers') and len(tiers) > 1:
+                return self.speculative_download(target_date, tiers)
+            
+            print(f"🔍 Téléchargement {optimal_product.upper()}...")
+            
+            result = self.download_product_type(target_date, optimal_product)
+            if result:
+                print(f"✅ Succès {optimal_product.upper()}")
+                return result
+            else:
+                print(f"❌ Échec {optimal_product.upper()}")
                 
-                # Les ultra-rapides IGS sont disponibles toutes les 6h: 00, 06, 12, 18 UTC
-                available_hours = []
+                # LOGIQUE DE FALLBACK AUTOMATIQUE
+                for fallback in tiers[1:]:
+                    print(f"🔄 Fallback automatique vers {fallback.upper()}...")
+                    result = self.download_product_type(target_date, fallback)
+                    if result:
+                        print(f"✅ Succès {fallback.upper()} (fallback)")
+                        return result
                 
-                if date_obj.date() == now.date():
-                    # Date d'aujourd'hui - calculer les heures disponibles avec délai 3h
-                    current_hour_utc = now.hour
-                    for h in [18, 12, 6, 0]:  # Ordre décroissant (plus récent en premier)
-                        if h <= current_hour_utc - 3:  # Délai de 3h
-                            available_hours.append(f"{h:02d}")
-                    
-                    # Si aucune heure disponible aujourd'hui, essayer hier soir
-                    if not available_hours:
-                        yesterday = date_obj - timedelta(days=1)
-                        _, _, yesterday_obj = self.date_to_gps_week(yesterday)
-                        yesterday_doy = yesterday_obj.timetuple().tm_yday
-                        for h in [18, 12]:  # Heures de fin de journée d'hier
-                            for interval in self.time_intervals:
-                                filenames.append(f"IGS0OPSULT_{year}{yesterday_doy:03d}{h:02d}00_02D_{interval}_ORB.SP3.gz")
-                                filenames.append(f"COD0OPSULT_{year}{yesterday_doy:03d}{h:02d}00_02D_{interval}_ORB.SP3.gz")
-                                filenames.append(f"GFZ0OPSULT_{year}{yesterday_doy:03d}{h:02d}00_02D_{interval}_ORB.SP3.gz")
-                else:
-                    # Date passée - toutes les heures disponibles
-                    available_hours = ['18', '12', '06', '00']
+                return None
+            
+        except Exception as e:
+            logger.error(f"Erreur téléchargement: {str(e)}")
+            return None
+    
+    def speculative_download(self, target_date, tiers):
+        """
+        Résolution spéculative : découverte lancée en parallèle pour tous les niveaux
+        Le meilleur niveau trouvé est téléchargé dès que tous les niveaux prioritaires ont échoué
+        """
+        # Un niveau déjà disponible localement borne la recherche : seuls les niveaux
+        # prioritaires restent à découvrir sur le réseau
+        local_tier, local_result = None, None
+        all_tiers = tiers
+        for tier in tiers:
+            filenames, _, _ = self.generate_combined_sp3_filenames(target_date, tier)
+            local_result = self.find_cached_product(filenames, current=True)
+            if local_result:
+                local_tier = tier
+                tiers = tiers[:tiers.index(tier)]
+                break
+        
+        if not tiers:
+            print(f"✅ Succès {local_tier.upper()} (local)")
+            return local_result
+        
+        print(f"🔍 Résolution parallèle: {' > '.join(t.upper() for t in tiers)}")
+        
+        executor = ThreadPoolExecutor(max_workers=len(tiers))
+        futures = [executor.submit(self.resolve_product_type, target_date, tier) for tier in tiers]
+        
+        try:
+            for tier, future in zip(tiers, futures):
+                # Attendre ce niveau : les niveaux inférieurs encore en cours ne peuvent pas le battre
+                resolved = future.result()
                 
-                # Ajouter les heures disponibles avec intervalles prioritaires
-                for hour in available_hours:
-                    for interval in self.time_intervals:
-                        # Format principal observé dans les exemples fournis
-                        filenames.append(f"IGS0OPSULT_{year}{doy:03d}{hour}00_02D_{interval}_ORB.SP3.gz")
-                        filenames.append(f"COD0OPSULT_{year}{doy:03d}{hour}00_02D_{interval}_ORB.SP3.gz")
-                        filenames.append(f"GFZ0OPSULT_{year}{doy:03d}{hour}00_02D_{interval}_ORB.SP3.gz")
-                        filenames.append(f"JPL0OPSULT_{year}{doy:03d}{hour}00_02D_{interval}_ORB.SP3.gz")
-                        
-                        # Variantes 1D (1 jour)
-                        filenames.append(f"IGS0OPSULT_{year}{doy:03d}{hour}00_01D_{interval}_ORB.SP3.gz")
-                        filenames.append(f"COD0OPSULT_{year}{doy:03d}{hour}00_01D_{interval}_ORB.SP3.gz")
-                        filenames.append(f"GFZ0OPSULT_{year}{doy:03d}{hour}00_01D_{interval}_ORB.SP3.gz")
+                if resolved:
+                    file_url, filename, gps_week = resolved
+                    result = self.download_file(file_url, filename, gps_week)
+                    if result:
+                        for other in futures:
+                            other.cancel()
+                        suffix = "" if tier == tiers[0] else " (fallback)"
+                        print(f"✅ Succès {tier.upper()}{suffix}")
+                        return result
                 
-                # Format hérité comme fallback (sans priorité d'intervalles)
-                legacy_hours = []
-                if date_obj.date() == now.date():
-                    current_hour = now.hour
-                    for h in [21, 18, 15, 12, 9, 6, 3, 0]:  # Toutes les 3h
-                        if h <= current_hour - 3:  # Avec délai de 3h
-                            legacy_hours.append(h)
-                    
-                    # Si pas d'heures disponibles aujourd'hui, essayer hier
-                    if not legacy_hours:
-                        yesterday = date_obj - timedelta(days=1)
-                        gps_week_y, day_of_week_y, _ = self.date_to_gps_week(yesterday)
-                        for h in [21, 18, 15, 12]:  # Heures de fin de journée d'hier
-                            filenames.append(f"igu{gps_week_y:04d}{day_of_week_y}_{h:02d}.sp3.Z")
-                else:
-                    # Date passée - toutes les heures disponibles (format ancien)
-                    legacy_hours = [21, 18, 15, 12, 9, 6, 3, 0]
+                # Découverte ou téléchargement en échec : le niveau suivant prend le relais
+                print(f"❌ Échec {tier.upper()}")
+            
+            # Réseau en échec : une émission antérieure disponible localement reste utilisable
+            if not local_result:
+                for local_tier in all_tiers:
+                    filenames, _, _ = self.generate_combined_sp3_filenames(target_date, local_tier)
+                    local_result = self.find_cached_product(filenames)
+                    if local_result:
+                        break
+            
+            if local_result:
+                print(f"✅ Succès {local_tier.upper()} (local, fallback)")
+            return local_result
+            
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def fetch_directory_listing(self, repository):
+        """
+        Récupère en une seule requête la liste des fichiers d'un répertoire de semaine GPS
+        Retourne un dictionnaire nom -> taille (None si inconnue), ou None si le listing est indisponible
+        """
+        # CDDIS fournit un listing texte compact via le suffixe "*?list",
+        # sinon on se rabat sur la page HTML du répertoire
+        for listing_url in (repository + "*?list", repository):
+            try:
+                response = self.session.get(listing_url, timeout=self.get_timeout())
+                self.latency.observe(response.elapsed.total_seconds())
                 
-                # Ajouter les heures legacy
-                for hour in legacy_hours:
-                    filenames.append(f"igu{gps_week:04d}{day_of_week}_{hour:02d}.sp3.Z")
-        
-        else:
-            # Format hérité (avant GPS Week 2238)
-            if product_type == 'final':
-                for center in ['cod', 'gfz', 'whu']:
-                    filenames.append(f"{center}{gps_week:04d}{day_of_week}.sp3.Z")
-                filenames.append(f"igs{gps_week:04d}{day_of_week}.sp3.Z")
-                    
-            elif product_type == 'rapid':
-                # Format hérité pour rapides
-                for center in ['cod', 'gfz', 'jpl']:
-                    filenames.append(f"{center}r{gps_week:04d}{day_of_week}.sp3.Z")
-                filenames.append(f"igr{gps_week:04d}{day_of_week}.sp3.Z")
-                    
-            elif product_type == 'ultra_rapid':
-                # Format hérité pour ultra-rapides avec logique d'heures
-                now = datetime.now()
+                if response.status_code != 200:
+                    continue
                 
-                if date_obj.date() == now.date():
-                    # Date d'aujourd'hui - heures disponibles avec délai
-                    current_hour = now.hour
-                    for hour in [21, 18, 15, 12, 9, 6, 3, 0]:
-                        if hour <= current_hour - 3:  # Délai de 3h
-                            filenames.append(f"igu{gps_week:04d}{day_of_week}_{hour:02d}.sp3.Z")
-                    
-                    # Si aucune heure disponible aujourd'hui, essayer hier
-                    if len([f for f in filenames if 'igu' in f]) == 0:
-                        yesterday = date_obj - timedelta(days=1)
-                        gps_week_y, day_of_week_y, _ = self.date_to_gps_week(yesterday)
-                        for hour in [21, 18]:
-                            filenames.append(f"igu{gps_week_y:04d}{day_of_week_y}_{hour:02d}.sp3.Z")
-                else:
-                    # Date passée - toutes les heures
-                    for hour in [21, 18, 15, 12, 9, 6, 3, 0]:
-                        filenames.append(f"igu{gps_week:04d}{day_of_week}_{hour:02d}.sp3.Z")
+                # Une redirection vers la page de connexion Earthdata n'est pas un listing
+                if urlparse(response.url).netloc != urlparse(listing_url).netloc:
+                    continue
                 
-                # Autres centres pour format hérité
-                for hour in [18, 12, 6, 0]:
-                    for center in ['cod', 'gfz']:
-                        filenames.append(f"{center}u{gps_week:04d}{day_of_week}_{hour:02d}.sp3.Z")
+                # Seuls les noms décodés comme produits SP3 comptent : une page sans aucun
+                # (portail, page d'erreur servie en 200) n'est pas un listing exploitable
+                listing = self.parse_directory_listing(response.text)
+                products = ProductName.index(listing)
+                names = {name: listing[name] for name, product in products.items() if product.format == 'SP3'}
+                if names:
+                    return names
+                    
+            except Exception as e:
+                logger.warning(f"Erreur listing {listing_url}: {str(e)}")
         
-        return filenames, gps_week, use_new_format
+        return None
     
-    def smart_download_sp3(self, target_date):
-        """Téléchargement intelligent avec sélection automatique du produit optimal"""
+    def listing_ttl(self, gps_week):
+        """
+        Durée de validité d'un listing de semaine GPS (en secondes)
+        Une semaine ne change plus une fois les finaux de tous les centres publiés : pas d'expiration
+        """
+        week_end = self.gps_epoch() + timedelta(weeks=gps_week + 1)
+        hours_since_end = (utc_now() - week_end).total_seconds() / 3600
+        
+        if hours_since_end >= self.schedule.latest('final'):
+            return None
+        return float(self.config.get('listing_cache_ttl_minutes')) * 60
+    
+    def negative_ttl(self, product_type, gps_week):
+        """
+        Durée de validité d'un résultat 404 (en secondes) selon le type de produit
+        Courte pour les rapides/ultra-rapides qui peuvent apparaître bientôt
+        """
+        ttl_minutes = self.config.get('negative_cache_ttl_minutes')
+        defaults = self.config.default_config['negative_cache_ttl_minutes']
+        
+        key = product_type
+        if product_type == 'final' and self.listing_ttl(gps_week) is None:
+            # Semaine ancienne : un final absent ne sera vraisemblablement jamais publié
+            key = 'final_old_week'
+        
+        return float(ttl_minutes.get(key, defaults.get(key, 15))) * 60
+    
+    def get_directory_listing(self, repository, gps_week):
+        """Listing d'un répertoire de semaine GPS, depuis le cache disque si possible"""
+        cached = self.listing_cache.get(repository)
+        if cached:
+            # Anciennes entrées : liste de noms sans tailles
+            return dict.fromkeys(cached) if isinstance(cached, list) else cached
+        
+        # Un listing vide n'est jamais mis en cache : le sondage HEAD reste possible
+        listing = self.fetch_directory_listing(repository)
+        if not listing:
+            return None
+        
+        self.listing_cache.set(repository, listing, self.listing_ttl(gps_week))
+        self.listing_cache.save()
+        return listing
+    
+    def parse_directory_listing(self, text):
+        """
+        Extrait les noms de fichiers d'un listing texte CDDIS ou d'une page HTML
+        Retourne un dictionnaire nom -> taille en octets (None si le listing ne la donne pas)
+        """
+        names = {}
+        
+        if '<a ' in text.lower():
+            # Listing HTML : récupérer les cibles des liens
+            for href in re.findall(r'href\s*=\s*["\']([^"\'?#]+)["\']', text, re.IGNORECASE):
+                name = unquote(href.rstrip('/').rsplit('/', 1)[-1])
+                if name:
+                    names[name] = None
+        else:
+            # Listing texte : "nom_fichier  taille" par ligne
+            for line in text.splitlines():
+                fields = line.split()
+                if fields and not fields[0].startswith('#'):
+                    names[fields[0]] = int(fields[1]) if len(fields) > 1 and fields[1].isdigit() else None
+        
+        return names
+    
+    def select_from_listing(self, filenames, listing):
+        """Retourne le premier candidat (ordre de priorité) présent dans le listing"""
+        for filename in filenames:
+            if filename in listing:
+                return filename
+        return None
+    
+    def probe_candidates(self, repository, filenames, miss_ttl=None):
+        """
+        Sondage HEAD concurrent des candidats avec un pool borné
+        Retourne le candidat trouvé de plus haute priorité (ordre de la liste)
+        Les 404 sont mémorisés dans le cache négatif si miss_ttl est fourni
+        Lève MirrorUnavailable si aucune sonde n'obtient de réponse exploitable
+        """
+        if not filenames:
+            return None
+        
+        workers = max(1, int(self.config.get('probe_workers') or 1))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        
+        # Index du meilleur candidat confirmé : les sondes d'index supérieur deviennent inutiles
+        state = {'best': len(filenames), 'abort': False}
+        lock = threading.Lock()
+        answered = False
+        
+        def probe(index):
+            with lock:
+                if state['abort'] or index > state['best']:
+                    return None
+            response = self.session.head(repository + filenames[index], timeout=self.head_timeout())
+            elapsed = response.elapsed.total_seconds()
+            self.latency.observe(elapsed)
+            if response.status_code in (200, 404):
+                self.scoreboard.record_probe(filenames[index], response.status_code == 200, elapsed)
+            if response.status_code == 200:
+                self.observe_publication(filenames[index], response)
+                # Taille annoncée : décide du transfert segmenté sans requête supplémentaire
+                if response.headers.get('Accept-Ranges', '').lower() == 'bytes':
+                    self.remember_size(filenames[index], int(response.headers.get('Content-Length') or 0))
+            return response.status_code
+        
+        futures = {executor.submit(probe, i): i for i in range(len(filenames))}
+        resolved = [False] * len(filenames)
+        
         try:
-            availability = self.analyze_data_availability(target_date)
-            
-            if availability['data_unavailable']:
-                print(f"❌ Aucun produit disponible (minimum 3h requis)")
-                return None
-            
-            optimal_product = availability['optimal_product']
-            print(f"🔍 Téléchargement {optimal_product.upper()}...")
-            
-            result = self.download_product_type(target_date, optimal_product)
-            if result:
-                print(f"✅ Succès {optimal_product.upper()}")
-                return result
-            else:
-                print(f"❌ Échec {optimal_product.upper()}")
+            for future in as_completed(futures):
+                j = futures[future]
+                resolved[j] = True
                 
-                # LOGIQUE DE FALLBACK AUTOMATIQUE
-                if optimal_product == 'ultra_rapid':
-                    print(f"🔄 Fallback automatique vers RAPID...")
-                    result = self.download_product_type(target_date, 'rapid')
-                    if result:
-                        print(f"✅ Succès RAPID (fallback)")
-                        return result
-                    
-                    print(f"🔄 Fallback automatique vers FINAL...")
-                    result = self.download_product_type(target_date, 'final')
-                    if result:
-                        print(f"✅ Succès FINAL (fallback)")
-                        return result
-                        
-                elif optimal_product == 'rapid':
-                    print(f"🔄 Fallback automatique vers FINAL...")
-                    result = self.download_product_type(target_date, 'final')
-                    if result:
-                        print(f"✅ Succès FINAL (fallback)")
-                        return result
+                if future.cancelled():
+                    continue
                 
-                return None
+                try:
+                    status_code = future.result()
+                except Exception:
+                    if j < 3:
+                        print(f"   ⚠️ Erreur réseau: {filenames[j]}")
+                    status_code = None
+                
+                if status_code in (200, 404):
+                    answered = True
+                
+                if status_code == 200:
+                    with lock:
+                        if j < state['best']:
+                            state['best'] = j
+                    # Annuler les sondes de priorité inférieure pas encore lancées
+                    for other, k in futures.items():
+                        if k > j:
+                            other.cancel()
+                elif status_code == 404:
+                    if miss_ttl is not None:
+                        self.negative_cache.set(repository + filenames[j], True, miss_ttl)
+                    # Afficher seulement les premiers échecs pour diagnostic
+                    if j < 1:
+                        print(f"   🔄  .........  ")
+                elif status_code == 401:
+                    print(f"   🔐 401 Authentification requise: {filenames[j]}")
+                    print(f"   💡 Vérifiez votre token JWT dans les paramètres")
+                    with lock:
+                        state['abort'] = True
+                    raise MirrorUnavailable("authentification refusée")
+                elif status_code is not None:
+                    if j < 3:
+                        print(f"   ⚠️ Erreur {status_code}: {filenames[j]}")
+                
+                # Le meilleur résultat est acquis dès que tous les candidats prioritaires sont résolus
+                best = state['best']
+                if best < len(filenames) and all(resolved[:best]):
+                    return filenames[best]
             
-        except Exception as e:
-            logger.error(f"Erreur téléchargement: {str(e)}")
+            if not answered:
+                raise MirrorUnavailable("aucune réponse aux sondes HEAD")
             return None
+            
+        finally:
+            # Ne pas attendre les sondes en vol devenues inutiles
+            executor.shutdown(wait=False, cancel_futures=True)
+            if miss_ttl is not None:
+                self.negative_cache.save()
+    
+    def report_found(self, filename):
+        """Affiche le fichier trouvé avec son intervalle"""
+        # Extraire l'intervalle du nom de fichier pour l'affichage
+        product = ProductName.parse(filename)
+        interval_match = product.sampling if product else None
+        
+        if interval_match:
+            print(f"   ✅ Trouvé [{interval_match}]: {filename}")
+        else:
+            print(f"   ✅ Trouvé: {filename}")
     
     def download_product_type(self, target_date, product_type):
         """Télécharge un type de produit spécifique"""
+        filenames, _, _ = self.generate_combined_sp3_filenames(target_date, product_type)
+        cached = self.find_cached_product(filenames, current=True)
+        if cached:
+            return cached
+        
+        resolved = self.resolve_product_type(target_date, product_type)
+        if resolved:
+            file_url, filename, gps_week = resolved
+            result = self.download_file(file_url, filename, gps_week)
+            if result:
+                return result
+        
+        # Réseau en échec : une émission antérieure disponible localement reste utilisable
+        return self.find_cached_product(filenames)
+    
+    def resolve_product_type(self, target_date, product_type):
+        """
+        Recherche le meilleur fichier disponible pour un type de produit
+        Retourne (url, nom_fichier, semaine_gps) ou None
+        """
         try:
             filenames, gps_week, use_new_format = self.generate_combined_sp3_filenames(target_date, product_type)
             
-            # Un seul répertoire maintenant (pas de MGEX)
-            repository = f"{self.cddis_base}/{gps_week:04d}/"
+            mirrors = self.mirrors.ordered()
+            if not mirrors:
+                print(f"   ❌ Aucun miroir configuré")
+                return None
             
             print(f"   Recherche de {len(filenames)} variantes de fichiers...")
             print(f"   📅 Semaine GPS: {gps_week}, Format: {'IGS20' if use_new_format else 'Hérité'}")
-            print(f"   📂 Répertoire: {repository}")
             
             # Afficher la priorité des intervalles
             if product_type in ['final', 'rapid', 'ultra_rapid'] and use_new_format:
@@ -418,70 +2538,324 @@ class SP3CombinedDownloader:
                 if len(filenames) > 5:
                     print(f"      ... et {len(filenames)-5} autres variantes")
             
-            # Recherche dans le répertoire unique
-            for j, filename in enumerate(filenames):
-                file_url = repository + filename
-                
+            # Découverte sur le miroir au meilleur débit récent ; un miroir injoignable
+            # est pénalisé et le suivant prend le relais
+            answered = False
+            for mirror in mirrors:
+                repository = mirror.repository(gps_week)
+                print(f"   📂 Répertoire: {repository} ({mirror.name})")
                 try:
-                    response = self.session.head(file_url, timeout=8)
-                    
-                    if response.status_code == 200:
-                        # Extraire l'intervalle du nom de fichier pour l'affichage
-                        interval_match = None
-                        for interval in self.time_intervals:
-                            if f"_{interval}_" in filename:
-                                interval_match = interval
-                                break
-                        
-                        if interval_match:
-                            print(f"   ✅ Trouvé [{interval_match}]: {filename}")
-                        else:
-                            print(f"   ✅ Trouvé: {filename}")
-                            
-                        return self.download_file(file_url, filename)
-                        
-                    elif response.status_code == 404:
-                        # Afficher seulement les premiers échecs pour diagnostic
-                        if j < 1:
-                            print(f"   🔄  .........  ")
-                    elif response.status_code == 401:
-                        print(f"   🔐 401 Authentification requise: {filename}")
-                        print(f"   💡 Vérifiez votre token JWT dans les paramètres")
-                        break
-                    else:
-                        if j < 3:
-                            print(f"   ⚠️ Erreur {response.status_code}: {filename}")
-                    
-                except Exception as e:
-                    if j < 3:
-                        print(f"   ⚠️ Erreur réseau: {filename}")
+                    filename = self.discover_on_mirror(repository, filenames, product_type, gps_week)
+                except MirrorUnavailable as e:
+                    print(f"   ⚠️ Miroir {mirror.name} indisponible ({e}), essai du miroir suivant")
+                    logger.warning(f"Miroir {mirror.name} indisponible: {str(e)}")
+                    self.mirrors.record_failure(repository)
+                    self.mirrors.save()
                     continue
+                
+                if filename:
+                    self.report_found(filename)
+                    return repository + filename, filename, gps_week
+                
+                # Semaine encore ouverte : un miroir peut ne pas avoir synchronisé un produit
+                # déjà publié ailleurs ; une semaine figée est identique sur tous les miroirs
+                answered = True
+                if self.listing_ttl(gps_week) is None:
+                    break
             
+            if not answered:
+                print(f"   ❌ Aucun miroir disponible")
+                return None
             print(f"   ❌ Aucun fichier {product_type} trouvé")
             return None
             
         except Exception as e:
-            logger.error(f"Erreur download_product_type: {str(e)}")
+            logger.error(f"Erreur resolve_product_type: {str(e)}")
             return None
+        finally:
+            self.scoreboard.save()
+    
+    def discover_on_mirror(self, repository, filenames, product_type, gps_week):
+        """
+        Meilleur candidat présent dans le répertoire d'un miroir (listing, sinon sondes HEAD)
+        Retourne le nom trouvé ou None ; lève MirrorUnavailable si le miroir ne répond pas
+        """
+        # Écarter les candidats récemment introuvables (cache négatif)
+        known_missing = {f for f in filenames if self.negative_cache.get(repository + f)}
+        if known_missing:
+            filenames = [f for f in filenames if f not in known_missing]
+            print(f"   🚫 {len(known_missing)} variantes ignorées (404 récents en cache)")
+        
+        # Découverte par listing du répertoire (une seule requête)
+        listing = None
+        if self.config.get('use_directory_listing'):
+            listing = self.get_directory_listing(repository, gps_week)
+        
+        if listing is not None:
+            print(f"   📑 Listing du répertoire: {len(listing)} fichiers")
+            filename = self.select_from_listing(filenames, listing)
+            # Candidats écartés avant le choix : absences connues sans aucune sonde
+            tried = filenames[:filenames.index(filename) + 1] if filename else filenames
+            for name in tried:
+                self.scoreboard.record_probe(name, name == filename)
+            if filename and listing[filename]:
+                self.remember_size(filename, listing[filename])
+            return filename
+        
+        # Repli : sondage HEAD des candidats
+        if self.config.get('use_directory_listing'):
+            print(f"   ⚠️ Listing indisponible, sondage HEAD des candidats")
+        return self.probe_candidates(repository, filenames, self.negative_ttl(product_type, gps_week))
     
-    def download_file(self, file_url, filename):
-        """Télécharge un fichier"""
+    def get_checksums(self, repository, gps_week):
+        """Manifeste SHA512SUMS d'un répertoire de semaine GPS (nom -> empreinte), depuis le cache si possible"""
+        cached = self.checksum_cache.get(repository)
+        if cached is not None:
+            return cached or None
+        
         try:
-            response = self.session.get(file_url, stream=True, timeout=120)
-            response.raise_for_status()
+            response = self.session.get(repository + "SHA512SUMS", timeout=self.get_timeout())
+            if response.status_code == 404:
+                # Miroir sans manifeste : inutile de le redemander avant expiration
+                self.checksum_cache.set(repository, {}, self.listing_ttl(gps_week))
+                self.checksum_cache.save()
+                return None
+            if response.status_code != 200:
+                return None
+            if urlparse(response.url).netloc != urlparse(repository).netloc:
+                return None
+        except Exception as e:
+            logger.warning(f"Erreur manifeste SHA512SUMS {repository}: {str(e)}")
+            return None
+        
+        checksums = {}
+        for line in response.text.splitlines():
+            parts = line.split()
+            if len(parts) == 2 and len(parts[0]) == 128 and 'sp3' in parts[1].lower():
+                checksums[parts[1].lstrip('*')] = parts[0].lower()
+        
+        if not checksums:
+            return None
+        
+        self.checksum_cache.set(repository, checksums, self.listing_ttl(gps_week))
+        self.checksum_cache.save()
+        return checksums
+    
+    def expected_checksum(self, file_url, filename, gps_week):
+        """Empreinte SHA-512 attendue d'un produit, ou None si indisponible"""
+        if not self.config.get('verify_checksums') or gps_week is None:
+            return None
+        
+        # Manifeste du miroir du fichier, sinon de n'importe quel autre miroir
+        expected = None
+        for url in self.mirrors.urls(filename, gps_week, preferred=file_url):
+            checksums = self.get_checksums(url[:-len(filename)], gps_week)
+            expected = checksums.get(filename) if checksums else None
+            if expected is not None:
+                break
+        if expected is None:
+            print(f"   ⚠️ Empreinte SHA-512 indisponible, fichier non vérifié")
+        return expected
+    
+    def fetch_verified(self, file_urls, sink, expected):
+        """
+        Transfert complet puis contrôle de l'empreinte calculée pendant le flux
+        En cas de différence, le transfert est recommencé depuis zéro
+        """
+        attempts = 1 + int(self.config.get('checksum_retries'))
+        
+        for attempt in range(attempts):
+            if not self.fetch_resumable(file_urls, sink):
+                return False
+            
+            if expected is None:
+                return True
+            
+            if sink.hasher.hexdigest() == expected:
+                print(f"   🔒 Empreinte SHA-512 vérifiée")
+                return True
+            
+            print(f"   ❌ Empreinte SHA-512 incorrecte, nouveau téléchargement...")
+            logger.warning(f"Empreinte SHA-512 incorrecte: {file_urls[0]}")
+            sink.reset()
+        
+        return False
+    
+    def find_cached_product(self, filenames, current=False):
+        """
+        Premier candidat (ordre de priorité) déjà disponible localement
+        Consulte le magasin, puis le répertoire de sortie pour les produits pas encore indexés
+        current : refuser une émission antérieure à un candidat prioritaire non disponible
+        (ultra-rapide 00h alors que 06h/12h/18h sont attendues) : seul le réseau peut l'écarter
+        """
+        newest = None
+        for filename in filenames:
+            product = ProductName.parse(filename) if current else None
+            if product:
+                if newest and product.start < newest:
+                    return None
+                newest = max(newest or product.start, product.start)
+            
+            entry = self.store.lookup(filename) if self.store is not None else None
+            if entry:
+                path = self.store.materialize(entry, self.output_dir)
+                self.catalog_product(filename, path, entry['sha512'])
+                print(f"   💾 Produit disponible localement: {path.name}")
+                return str(path)
             
+            local_path = self.output_dir / filename
+            if local_path.suffix in ('.gz', '.Z'):
+                local_path = local_path.with_suffix('')
+            
+            if self.verified_output(local_path):
+                digest = self.store.add(filename, local_path) if self.store is not None else None
+                self.catalog_product(filename, local_path, digest)
+                print(f"   💾 Produit disponible localement: {local_path.name}")
+                return str(local_path)
+        
+        return None
+    
+    def verified_output(self, local_path):
+        """
+        Un fichier du répertoire de sortie n'est réutilisé que s'il a été enregistré au catalogue
+        après un téléchargement abouti, avec la même taille (sinon : reste d'un échec, copie externe)
+        """
+        if self.catalog is None or not local_path.exists():
+            return False
+        try:
+            entry = self.catalog.entry(local_path)
+        except Exception as e:
+            logger.warning(f"Erreur catalogue {local_path.name}: {str(e)}")
+            return False
+        return entry is not None and entry['size'] == local_path.stat().st_size
+    
+    def download_file(self, file_url, filename, gps_week=None):
+        """
+        Télécharge un fichier, sauf s'il est déjà dans le magasin local, puis l'y enregistre
+        Un seul téléchargement par produit : partagé entre threads, verrouillé entre processus
+        """
+        return self.inflight.do(('file', filename), self.download_file_locked, file_url, filename, gps_week)
+    
+    def download_file_locked(self, file_url, filename, gps_week=None):
+        """Téléchargement sous verrou de fichier dans le répertoire de sortie"""
+        lock = FileLock(self.output_dir / ".locks" / (filename + ".lock"))
+        if not lock.acquire(blocking=False):
+            print(f"⏳ {filename} en cours de téléchargement par un autre processus, attente...")
+            lock.acquire()
+        
+        try:
+            # Un autre processus a pu terminer ce produit pendant l'attente
+            cached = self.find_cached_product([filename])
+            if cached:
+                return cached
+            return self.fetch_product(file_url, filename, gps_week)
+        finally:
+            lock.release()
+    
+    def fetch_product(self, file_url, filename, gps_week=None):
+        """Transfère un produit puis l'enregistre dans le magasin et le catalogue"""
+        started = time.monotonic()
+        result = self.transfer_product(file_url, filename, gps_week)
+        
+        with self.stats_lock:
+            published = self.published.pop(filename, None)
+        if result:
+            self.scoreboard.record_transfer(filename, time.monotonic() - started, utc_now(), published)
+            self.scoreboard.save()
+        self.mirrors.save()
+        
+        if result and not result.endswith(('.gz', '.Z')):
+            digest = None
+            if self.store is not None:
+                try:
+                    digest = self.store.add(filename, result)
+                except Exception as e:
+                    logger.warning(f"Erreur ajout au magasin {filename}: {str(e)}")
+            self.catalog_product(filename, result, digest, published)
+            self.index_product(result)
+        
+        return result
+    
+    def remember_size(self, filename, size):
+        if size:
+            with self.stats_lock:
+                self.known_sizes[filename] = size
+    
+    def observe_publication(self, filename, response):
+        """Retient la date de mise en ligne (Last-Modified) annoncée pour un produit"""
+        published = http_date(response.headers.get('Last-Modified'))
+        if published is not None:
+            with self.stats_lock:
+                self.published[filename] = published
+    
+    def index_product(self, path):
+        """Construit l'index des époques à côté du produit (lectures par fenêtre de temps)"""
+        if not self.config.get('build_epoch_index') or np is None:
+            return
+        try:
+            build_sp3_index(path)
+        except Exception as e:
+            logger.warning(f"Erreur index des époques {Path(path).name}: {str(e)}")
+    
+    def catalog_product(self, product_name, path, sha512=None, published=None):
+        """Enregistre un produit dans le catalogue s'il n'y figure pas déjà"""
+        if self.catalog is None:
+            return
+        try:
+            if published is not None or not self.catalog.contains(path):
+                self.catalog.record(product_name, path, sha512, published)
+        except Exception as e:
+            logger.warning(f"Erreur catalogue {product_name}: {str(e)}")
+    
+    def transfer_product(self, file_url, filename, gps_week=None):
+        """Télécharge un fichier via un fichier .part repris en cas d'interruption"""
+        try:
             output_path = self.output_dir / filename
+            expected = self.expected_checksum(file_url, filename, gps_week)
+            
+            # Le même produit sur les autres miroirs : course au premier octet et relais en cours de route
+            file_urls = self.mirrors.urls(filename, gps_week, preferred=file_url) if gps_week is not None else [file_url]
             
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # Gros produits (01S, 30S) : segments parallèles si le serveur accepte Range
+            complete = None
+            size = self.segmented_size(filename) if self.config.get('segmented_downloads') else None
+            if size:
+                complete = self.download_segmented(file_urls, output_path, size, expected)
+                if complete is False:
+                    logger.error(f"Erreur téléchargement {filename}: transfert segmenté incomplet")
+                    return None
+            # Transfert segmenté : la taille est connue d'avance
+            verified = complete is True
+            
+            if complete is None:
+                if self.config.get('streaming_decompression'):
+                    if filename.endswith('.gz'):
+                        return self.download_decompressed(file_urls, output_path, GzipStreamDecoder, expected)
+                    elif filename.endswith('.Z'):
+                        return self.download_decompressed(file_urls, output_path, UnixZDecoder, expected)
+                
+                part_path = output_path.with_name(output_path.name + '.part')
+                sink = PartFileSink(part_path)
+                try:
+                    complete = self.fetch_verified(file_urls, sink, expected)
+                finally:
+                    sink.close()
+                
+                if not complete:
+                    logger.error(f"Erreur téléchargement {filename}: transfert incomplet ou corrompu")
+                    if part_path.exists() and expected is not None:
+                        part_path.unlink()
+                    return None
+                verified = expected is not None or sink.total is not None
+                
+                # Renommage atomique une fois la taille (et l'empreinte) validée
+                os.replace(part_path, output_path)
             
             # Décompression automatique
             if filename.endswith('.gz'):
                 return self.decompress_file(output_path)
             elif filename.endswith('.Z'):
-                return self.decompress_unix_z(output_path)
+                return self.decompress_unix_z(output_path, verified)
             
             return str(output_path)
                     
@@ -489,15 +2863,398 @@ class SP3CombinedDownloader:
             logger.error(f"Erreur téléchargement {filename}: {str(e)}")
             return None
     
+    def segmented_size(self, filename):
+        """
+        Taille du fichier si un transfert segmenté est utile : taille connue par la découverte
+        (listing ou sonde HEAD, aucune requête ici) et au-delà du seuil configuré ; sinon None
+        Un serveur qui ignore Range est détecté à la première plage (repli sur un flux unique)
+        """
+        with self.stats_lock:
+            size = self.known_sizes.get(filename)
+        if not size:
+            return None
+        
+        threshold = float(self.config.get('segment_threshold_mb')) * 1024 * 1024
+        return size if size >= threshold else None
+    
+    def download_segmented(self, file_urls, output_path, size, expected=None):
+        """
+        Télécharge un fichier en plages d'octets parallèles vers un fichier préalloué
+        L'avancement de chaque plage est noté dans <nom>.segments.json : un transfert interrompu
+        reprend là où il s'était arrêté, y compris lors d'une exécution suivante
+        Retourne True (complet et vérifié), False (échec) ou None (Range ignoré ou empreinte
+        incorrecte : le transfert en flux unique prend le relais)
+        """
+        workers = max(1, int(self.config.get('segment_workers') or 1))
+        segment_path = output_path.with_name(output_path.name + '.segments')
+        progress_path = segment_path.with_name(segment_path.name + '.json')
+        
+        progress = self.load_segment_progress(segment_path, progress_path, size)
+        if progress is None:
+            # Préallocation : chaque segment écrit à sa position via son propre descripteur
+            with open(segment_path, 'wb') as f:
+                f.truncate(size)
+            step = -(-size // workers)
+            progress = {'size': size,
+                        'ranges': [[start, start, min(start + step, size) - 1] for start in range(0, size, step)]}
+            print(f"   🧩 Téléchargement segmenté: {len(progress['ranges'])} plages de {step / 1e6:.1f} Mo")
+        else:
+            done = sum(offset - start for start, offset, end in progress['ranges'])
+            print(f"   ⏯️ Reprise segmentée à {done:,} octets")
+        
+        ranges = progress['ranges']
+        # Empreinte calculée sur les blocs reçus (pas de relecture du fichier assemblé)
+        hasher = None
+        if expected is not None:
+            hasher = SegmentHasher(segment_path, {start: offset for start, offset, end in ranges if offset > start})
+        state = {'abort': False, 'range_ignored': False, 'lock': threading.Lock(),
+                 'progress': progress, 'progress_path': progress_path, 'hasher': hasher}
+        self.save_segment_progress(state)
+        
+        pending = [segment for segment in ranges if segment[1] <= segment[2]]
+        complete = True
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = [executor.submit(self.fetch_segment, file_urls, segment_path, segment, state)
+                           for segment in pending]
+                complete = all([future.result() for future in futures])
+        
+        if state['range_ignored']:
+            print(f"   ⚠️ Plages ignorées par le serveur, repli sur un flux unique")
+            self.discard_segments(segment_path, progress_path)
+            return None
+        if not complete:
+            # Fichier et avancement conservés pour la reprise
+            return False
+        
+        if hasher is not None:
+            if hasher.hexdigest() != expected:
+                print(f"   ❌ Empreinte SHA-512 incorrecte, nouveau téléchargement...")
+                logger.warning(f"Empreinte SHA-512 incorrecte: {file_urls[0]}")
+                self.discard_segments(segment_path, progress_path)
+                return None
+            print(f"   🔒 Empreinte SHA-512 vérifiée")
+        
+        os.replace(segment_path, output_path)
+        self.discard_segments(progress_path)
+        return True
+    
+    def load_segment_progress(self, segment_path, progress_path, size):
+        """Avancement d'un transfert segmenté précédent, ou None s'il ne correspond plus"""
+        try:
+            if not segment_path.exists() or segment_path.stat().st_size != size:
+                return None
+            with open(progress_path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+            if progress.get('size') != size:
+                return None
+            if not all(start <= offset <= end + 1 for start, offset, end in progress['ranges']):
+                return None
+            return progress
+        except Exception:
+            return None
+    
+    def save_segment_progress(self, state):
+        """Écriture atomique de l'avancement des plages"""
+        progress_path = state['progress_path']
+        temp_path = progress_path.with_name(progress_path.name + '.tmp')
+        with state['lock']:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state['progress'], f)
+            os.replace(temp_path, progress_path)
+    
+    @staticmethod
+    def discard_segments(*paths):
+        for path in paths:
+            if path.exists():
+                path.unlink()
+    
+    def fetch_segment(self, file_urls, segment_path, segment, state):
+        """
+        Télécharge la plage segment = [début, position, fin] à sa place dans le fichier,
+        avec reprise et relais de miroir ; la position est enregistrée dans l'avancement
+        """
+        retries = int(self.config.get('download_retries'))
+        urls = list(file_urls)
+        start, _, end = segment
+        
+        try:
+            for attempt in range(retries + 1):
+                if state['abort']:
+                    return False
+                if attempt > 0:
+                    time.sleep(self.backoff_delay(attempt))
+                
+                file_url = urls[0]
+                started = time.monotonic()
+                received = 0
+                try:
+                    with self.session.get(file_url, stream=True, timeout=self.get_timeout(),
+                                          headers={'Range': f'bytes={segment[1]}-{end}'}) as response:
+                        self.latency.observe(response.elapsed.total_seconds())
+                        if response.status_code == 200:
+                            # Fichier entier renvoyé : les autres segments sont inutiles
+                            state['range_ignored'] = state['abort'] = True
+                            return False
+                        
+                        content_range = response.headers.get('Content-Range', '')
+                        if response.status_code != 206 or not content_range.startswith(f'bytes {segment[1]}-'):
+                            raise ValueError(f"réponse {response.status_code} inattendue ({content_range})")
+                        self.observe_publication(file_url.rsplit('/', 1)[-1], response)
+                        
+                        with open(segment_path, 'r+b') as f:
+                            f.seek(segment[1])
+                            for chunk in response.raw.stream(65536, decode_content=False):
+                                if state['abort']:
+                                    return False
+                                chunk = chunk[:end + 1 - segment[1]]
+                                f.write(chunk)
+                                if state['hasher'] is not None:
+                                    state['hasher'].update(segment[1], chunk)
+                                segment[1] += len(chunk)
+                                received += len(chunk)
+                                with self.stats_lock:
+                                    self.bytes_received += len(chunk)
+                    
+                    self.mirrors.record_transfer(file_url, received, time.monotonic() - started)
+                    if segment[1] == end + 1:
+                        return True
+                    
+                except Exception as e:
+                    logger.warning(f"Segment {start}-{end} interrompu {file_url}: {str(e)}")
+                
+                self.mirrors.record_failure(file_url)
+                urls = urls[1:] + urls[:1]
+            
+            state['abort'] = True
+            return False
+        finally:
+            # Le fichier est refermé : la position enregistrée ne dépasse pas les octets écrits
+            self.save_segment_progress(state)
+    
+    def download_decompressed(self, file_urls, compressed_path, decoder_factory, expected=None):
+        """
+        Télécharge et décompresse en une seule passe, sans archive intermédiaire
+        La sortie reste en .part tant que l'empreinte du flux compressé n'est pas validée
+        """
+        decompressed_path = compressed_path.with_suffix('')
+        output_part = decompressed_path.with_name(decompressed_path.name + '.part')
+        
+        # Copie du flux compressé : archive conservée (nettoyage automatique désactivé)
+        # ou reprise entre deux exécutions sur option ; sinon, aucune écriture de l'archive
+        auto_cleanup = self.config.get('auto_cleanup')
+        keep_compressed = auto_cleanup is not None and not auto_cleanup
+        compressed_part = None
+        if keep_compressed or self.config.get('resumable_streaming'):
+            compressed_part = compressed_path.with_name(compressed_path.name + '.part')
+        
+        print(f"📦 Décompression à la volée: {decompressed_path.name}")
+        sink = DecompressingSink(decoder_factory, output_part, compressed_part)
+        corrupted = False
+        try:
+            complete = self.fetch_verified(file_urls, sink, expected)
+            if complete:
+                sink.finish()
+        except (ValueError, zlib.error) as e:
+            logger.error(f"Erreur décompression {compressed_path.name}: {str(e)}")
+            complete = False
+            corrupted = True
+        finally:
+            sink.close()
+        
+        if not complete:
+            logger.error(f"Erreur téléchargement {compressed_path.name}: transfert incomplet ou corrompu")
+            if output_part.exists():
+                output_part.unlink()
+            # Un flux illisible ne se reprend pas ; un transfert coupé, si
+            if corrupted and compressed_part and compressed_part.exists():
+                compressed_part.unlink()
+            return None
+        
+        os.replace(output_part, decompressed_path)
+        
+        # Rien n'atteste qu'un flux .Z sans taille ni empreinte est complet
+        verified = expected is not None or sink.verified
+        if not verified:
+            print(f"⚠️ Taille non vérifiée: {compressed_path.name}")
+        
+        # L'archive n'est conservée que si le nettoyage automatique est désactivé,
+        # ou si le flux n'a pas été vérifié
+        if compressed_part:
+            if keep_compressed or not verified:
+                os.replace(compressed_part, compressed_path)
+            else:
+                compressed_part.unlink()
+        
+        size = decompressed_path.stat().st_size
+        print(f"✅ Décompression réussie: {size:,} octets")
+        return str(decompressed_path)
+    
+    def fetch_resumable(self, file_urls, sink):
+        """
+        Transfère le produit vers sink en reprenant avec des requêtes Range
+        file_urls : le même fichier sur chaque miroir ; après une coupure, la reprise
+        se fait sur le miroir suivant à partir des octets déjà reçus
+        Retourne True quand le nombre d'octets reçus correspond à Content-Length
+        """
+        retries = int(self.config.get('download_retries'))
+        urls = list(file_urls)
+        
+        for attempt in range(retries + 1):
+            if attempt > 0:
+                time.sleep(self.backoff_delay(attempt))
+            
+            offset = sink.size
+            headers = {'Range': f'bytes={offset}-'} if offset else {}
+            total = None
+            file_url = urls[0]
+            
+            try:
+                file_url, response = self.open_transfer(urls, headers)
+                started = time.monotonic()
+                received = 0
+                with response:
+                    self.latency.observe(response.elapsed.total_seconds())
+                    if response.status_code == 416:
+                        # Plage hors limites : transfert déjà complet ou incohérent
+                        total = self.parse_content_range_total(response.headers.get('Content-Range'))
+                        if total is not None and offset == total:
+                            sink.total = total
+                            return True
+                        sink.reset()
+                        continue
+                    
+                    if 400 <= response.status_code < 500:
+                        if len(urls) > 1:
+                            # Produit absent de ce miroir : essayer les autres
+                            urls.remove(file_url)
+                            continue
+                        response.raise_for_status()
+                    
+                    if response.status_code >= 500:
+                        print(f"   ⚠️ Erreur serveur {response.status_code}, nouvelle tentative...")
+                        self.mirrors.record_failure(file_url)
+                        urls = [u for u in urls if u != file_url] + [file_url]
+                        continue
+                    
+                    self.observe_publication(file_url.rsplit('/', 1)[-1], response)
+                    if response.status_code == 206:
+                        total = self.parse_content_range_total(response.headers.get('Content-Range'))
+                        if offset:
+                            print(f"   ⏯️ Reprise à {offset:,} octets")
+                    else:
+                        # Serveur sans support Range : repartir de zéro
+                        content_length = response.headers.get('Content-Length')
+                        total = int(content_length) if content_length else None
+                        if offset:
+                            sink.reset()
+                    
+                    # Flux brut : les tailles doivent correspondre aux octets du serveur
+                    for chunk in response.raw.stream(8192, decode_content=False):
+                        if chunk:
+                            sink.write(chunk)
+                            received += len(chunk)
+                            with self.stats_lock:
+                                self.bytes_received += len(chunk)
+                
+                self.mirrors.record_transfer(file_url, received, time.monotonic() - started)
+                if total is None or sink.size == total:
+                    sink.total = total
+                    return True
+                print(f"   ⚠️ Transfert incomplet ({sink.size:,}/{total:,} octets), reprise...")
+                
+            except requests.exceptions.HTTPError:
+                raise
+            except (zlib.error, UnixZError) as e:
+                # Données compressées invalides : recommencer le transfert complet
+                logger.warning(f"Flux compressé invalide {file_url}: {str(e)}")
+                sink.reset()
+            except Exception as e:
+                logger.warning(f"Transfert interrompu {file_url}: {str(e)}")
+                print(f"   ⚠️ Transfert interrompu, reprise...")
+            
+            # Coupure : relais sur le miroir suivant (reprise Range depuis sink.size)
+            self.mirrors.record_failure(file_url)
+            if len(urls) > 1:
+                urls = [u for u in urls if u != file_url] + [file_url]
+                mirror = self.mirrors.mirror_for(urls[0])
+                print(f"   🔀 Relais sur le miroir {mirror.name if mirror else urls[0]}")
+        
+        return False
+    
+    def open_transfer(self, urls, headers):
+        """
+        Ouvre le flux GET du produit ; avec plusieurs miroirs, course au premier octet :
+        la première réponse valable l'emporte, les autres connexions sont fermées
+        Retourne (url, réponse)
+        """
+        if len(urls) == 1 or not self.config.get('race_mirrors'):
+            return urls[0], self.session.get(urls[0], stream=True, timeout=self.get_timeout(), headers=headers)
+        
+        executor = ThreadPoolExecutor(max_workers=len(urls))
+        futures = {executor.submit(self.session.get, url, stream=True, timeout=self.get_timeout(),
+                                   headers=headers): url for url in urls}
+        outcomes = {}
+        try:
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except Exception as e:
+                    outcomes[futures[future]] = e
+                    self.mirrors.record_failure(futures[future])
+                    continue
+                
+                if response.status_code < 400 or response.status_code == 416:
+                    for other, url in futures.items():
+                        if other is not future:
+                            other.add_done_callback(lambda f, url=url: self.close_loser(url, f))
+                    return futures[future], response
+                if response.status_code >= 500:
+                    self.mirrors.record_failure(futures[future])
+                outcomes[futures[future]] = response
+            
+            # Aucun miroir valable : la réponse du miroir préféré sert au diagnostic
+            for url, outcome in outcomes.items():
+                if url != urls[0] and not isinstance(outcome, Exception):
+                    outcome.close()
+            if isinstance(outcomes[urls[0]], Exception):
+                raise outcomes[urls[0]]
+            return urls[0], outcomes[urls[0]]
+        finally:
+            executor.shutdown(wait=False)
+    
+    def close_loser(self, url, future):
+        """Ferme la connexion d'un perdant de la course au premier octet ; un miroir en erreur est pénalisé"""
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.mirrors.record_failure(url)
+            return
+        response = future.result()
+        if response.status_code >= 500:
+            self.mirrors.record_failure(url)
+        response.close()
+    
+    def parse_content_range_total(self, content_range):
+        """Extrait la taille totale d'un en-tête Content-Range ("bytes 0-99/1234")"""
+        if content_range and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1].strip()
+            if total.isdigit():
+                return int(total)
+        return None
+    
     def decompress_file(self, compressed_path):
         """Décompresse un fichier .gz avec gestion d'erreurs"""
+        decompressed_path = compressed_path.with_suffix('')
+        output_part = decompressed_path.with_name(decompressed_path.name + '.part')
         try:
-            decompressed_path = compressed_path.with_suffix('')
             print(f"📦 Décompression gzip: {decompressed_path.name}")
             
+            # Sortie en .part : le produit final n'apparaît qu'une fois complet
             with gzip.open(compressed_path, 'rb') as f_in:
-                with open(decompressed_path, 'wb') as f_out:
-                    f_out.write(f_in.read())
+                with open(output_part, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+            os.replace(output_part, decompressed_path)
             
             # Supprimer le fichier compressé pour économiser l'espace
             auto_cleanup = self.config.get('auto_cleanup')
@@ -509,30 +3266,44 @@ class SP3CombinedDownloader:
             return str(decompressed_path)
             
         except Exception as e:
+            if output_part.exists():
+                output_part.unlink()
             logger.error(f"Erreur décompression gzip: {str(e)}")
             print(f"❌ Erreur décompression: {str(e)}")
             return str(compressed_path)
     
-    def decompress_unix_z(self, compressed_path):
-        """Décompresse un fichier .Z (Unix compress)"""
+    def decompress_unix_z(self, compressed_path, verified=False):
+        """
+        Décompresse un fichier .Z (Unix compress) avec le décodeur LZW intégré
+        verified : taille ou empreinte du transfert contrôlée ; sinon l'archive est conservée,
+        le format .Z ne permettant pas de détecter une troncature
+        """
+        decompressed_path = compressed_path.with_suffix('')
+        output_part = decompressed_path.with_name(decompressed_path.name + '.part')
         try:
-            import subprocess
-            decompressed_path = compressed_path.with_suffix('')
             print(f"📦 Décompression Unix .Z: {decompressed_path.name}")
             
-            # Essayer la commande uncompress
-            result = subprocess.run(['uncompress', str(compressed_path)], 
-                                  capture_output=True, text=True, timeout=60)
+            decoder = UnixZDecoder()
+            with open(compressed_path, 'rb') as f_in:
+                with open(output_part, 'wb') as f_out:
+                    for chunk in iter(lambda: f_in.read(1024 * 1024), b''):
+                        f_out.write(decoder.decompress(chunk))
+            os.replace(output_part, decompressed_path)
             
-            if result.returncode == 0 and decompressed_path.exists():
-                size = decompressed_path.stat().st_size
-                print(f"✅ Décompression Unix réussie: {size:,} octets")
-                return str(decompressed_path)
-            else:
-                print(f"⚠️ Décompression Unix échouée, fichier gardé compressé")
-                return str(compressed_path)
+            # Supprimer le fichier compressé pour économiser l'espace
+            auto_cleanup = self.config.get('auto_cleanup')
+            if not verified:
+                print(f"⚠️ Archive conservée (taille non vérifiée): {compressed_path.name}")
+            elif auto_cleanup is None or auto_cleanup:  # Par défaut True
+                compressed_path.unlink()
+            
+            size = decompressed_path.stat().st_size
+            print(f"✅ Décompression Unix réussie: {size:,} octets")
+            return str(decompressed_path)
                 
         except Exception as e:
+            if output_part.exists():
+                output_part.unlink()
             logger.warning(f"Erreur décompression Unix: {str(e)}")
             print(f"⚠️ Fichier gardé compressé: {compressed_path}")
             return str(compressed_path)
@@ -553,42 +3324,23 @@ class SP3CombinedDownloader:
                 print(f"❌ Fichier encore compressé - décompression a échoué")
                 return False
             
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-            
             # Vérifier que le fichier n'est pas vide
-            if not lines:
+            file_size = Path(file_path).stat().st_size
+            if file_size == 0:
                 print(f"❌ Fichier vide")
                 return False
             
-            satellites = {}
-            constellations = set()
-            all_satellites = set()
-            
-            for line in lines[:200]:
-                if line.startswith('+'):
-                    sat_section = line[9:].strip()
-                    pos = 0
-                    while pos < len(sat_section):
-                        if pos + 2 < len(sat_section):
-                            sat_id = sat_section[pos:pos+3]
-                            if len(sat_id) == 3 and sat_id[0].isalpha() and sat_id[1:].isdigit():
-                                constellation = sat_id[0].upper()
-                                constellations.add(constellation)
-                                all_satellites.add(sat_id)
-                                if constellation not in satellites:
-                                    satellites[constellation] = set()
-                                satellites[constellation].add(sat_id)
-                        pos += 3
+            # En-tête seul : coût constant quelle que soit la taille du fichier
+            header = read_sp3_header(file_path)
+            satellites = header['constellations']
+            constellations = set(satellites)
+            total_satellites = len(header['satellites'])
             
             constellation_names = {
                 'G': 'GPS', 'R': 'GLONASS', 'E': 'Galileo', 
                 'C': 'BeiDou', 'J': 'QZSS', 'S': 'SBAS'
             }
             
-            file_size = Path(file_path).stat().st_size
-            total_satellites = len(all_satellites)
-            
             print(f"💾 Taille: {file_size / (1024*1024):.2f} MB")
             print(f"🛰️ Satellites: {total_satellites}")
             print(f"🌐 Constellations: {len(constellations)}")
@@ -597,15 +3349,22 @@ class SP3CombinedDownloader:
                 print(f"⚠️ Aucun satellite détecté - vérifiez le format du fichier")
                 # Afficher les premières lignes pour diagnostic
                 print(f"📋 Premières lignes du fichier:")
-                for i, line in enumerate(lines[:5]):
-                    print(f"   {i+1}: {line.strip()}")
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    for i, line in zip(range(5), f):
+                        print(f"   {i+1}: {line.strip()}")
                 return False
             
             for const_code in sorted(constellations):
                 const_name = constellation_names.get(const_code, f'Constellation {const_code}')
-                sat_count = len(satellites.get(const_code, []))
+                sat_count = satellites.get(const_code, 0)
                 print(f"   {const_name}: {sat_count}")
             
+            if header['n_epochs']:
+                interval = f", intervalle {header['interval']:g} s" if header['interval'] else ""
+                print(f"⏱️ Époques: {header['n_epochs']}{interval}")
+            if header['time_system'] or header['agency']:
+                print(f"🕐 Système de temps: {header['time_system'] or '?'}, agence: {header['agency'] or '?'}")
+            
             return True
             
         except Exception as e:
@@ -716,8 +3475,8 @@ def download_sp3_file(config_manager):
         print(f"• Finaux: Délai 12+ jours minimum")
         
         # Suggestions de dates
-        yesterday = datetime.now() - timedelta(days=1)
-        last_week = datetime.now() - timedelta(days=7)
+        yesterday = utc_now() - timedelta(days=1)
+        last_week = utc_now() - timedelta(days=7)
         print(f"• Suggestions: {yesterday.strftime('%d/%m/%Y')} ou {last_week.strftime('%d/%m/%Y')}")
         
         target_date = input("\nDate (DD/MM/YYYY): ").strip()
@@ -730,12 +3489,12 @@ def download_sp3_file(config_manager):
             date_obj = datetime.strptime(target_date, "%d/%m/%Y")
             
             # Vérifier que la date n'est pas dans le futur
-            if date_obj > datetime.now():
+            if date_obj > utc_now():
                 print("❌ Date future invalide")
                 continue
             
             # Vérifier que la date n'est pas trop ancienne (>5 ans)
-            five_years_ago = datetime.now() - timedelta(days=5*365)
+            five_years_ago = utc_now() - timedelta(days=5*365)
             if date_obj < five_years_ago:
                 print(f"⚠️ Date très ancienne. Les données peuvent ne plus être disponibles.")
                 confirm = input("Continuer quand même? (o/n): ").strip().lower()
@@ -743,7 +3502,7 @@ def download_sp3_file(config_manager):
                     continue
             
             # Avertissement pour dates très récentes
-            hours_ago = (datetime.now() - date_obj).total_seconds() / 3600
+            hours_ago = (utc_now() - date_obj).total_seconds() / 3600
             if hours_ago < 6:
                 print(f"⚠️ Date très récente ({hours_ago:.1f}h). Les ultra-rapides peuvent être indisponibles.")
                 confirm = input("Continuer quand même? (o/n): ").strip().lower()
@@ -801,12 +3560,74 @@ def download_sp3_file(config_manager):
     
     input("Appuyez sur Entrée pour continuer...")
 
+def download_sp3_range(config_manager):
+    """Téléchargement groupé sur une période, une liste de dates ou de semaines GPS"""
+    downloader = SP3CombinedDownloader(config_manager)
+    
+    print(f"\n📆 TÉLÉCHARGEMENT GROUPÉ")
+    print(f"1. Période (date début - date fin)")
+    print(f"2. Liste de dates")
+    print(f"3. Semaines GPS")
+    choice = input("\nChoix (1-3): ").strip()
+    
+    try:
+        if choice == '1':
+            start = input("Date début (DD/MM/YYYY): ").strip()
+            end = input("Date fin (DD/MM/YYYY): ").strip()
+            dates = downloader.expand_dates(start=start, end=end)
+        elif choice == '2':
+            entries = input("Dates séparées par des espaces (DD/MM/YYYY): ").split()
+            dates = downloader.expand_dates(dates=entries)
+        elif choice == '3':
+            weeks = input("Semaines GPS séparées par des espaces: ").split()
+            dates = downloader.expand_dates(gps_weeks=weeks)
+        else:
+            print(f"❌ Choix invalide")
+            return
+    except ValueError:
+        print("❌ Format invalide")
+        input("Appuyez sur Entrée pour continuer...")
+        return
+    
+    if not dates:
+        print("❌ Aucune date à traiter")
+        input("Appuyez sur Entrée pour continuer...")
+        return
+    
+    workers = input(f"Workers (Entrée = {config_manager.get('bulk_workers')}): ").strip()
+    downloader.bulk_download(dates, int(workers) if workers.isdigit() else None)
+    
+    input("Appuyez sur Entrée pour continuer...")
+
+def run_command_line(config_manager, argv):
+    """Mode ligne de commande (téléchargement groupé sans menu)"""
+    parser = argparse.ArgumentParser(description="Téléchargeur SP3 - mode groupé")
+    parser.add_argument('--debut', help="Date de début (YYYY-MM-DD ou DD/MM/YYYY)")
+    parser.add_argument('--fin', help="Date de fin incluse (défaut: date de début)")
+    parser.add_argument('--dates', nargs='+', default=[], help="Liste de dates")
+    parser.add_argument('--semaines', nargs='+', type=int, default=[], help="Liste de semaines GPS")
+    parser.add_argument('--workers', type=int, help="Nombre de workers")
+    args = parser.parse_args(argv)
+    
+    downloader = SP3CombinedDownloader(config_manager)
+    dates = downloader.expand_dates(start=args.debut, end=args.fin,
+                                    dates=args.dates, gps_weeks=args.semaines)
+    if not dates:
+        parser.error("aucune date à traiter (--debut, --dates ou --semaines)")
+    
+    results = downloader.bulk_download(dates, args.workers)
+    return 0 if all(r['path'] for r in results) else 1
+
 def main():
     """Application principale avec menu"""
     
     # Initialiser la configuration
     config_manager = ConfigManager()
     
+    # Arguments fournis : mode groupé non interactif
+    if len(sys.argv) > 1:
+        sys.exit(run_command_line(config_manager, sys.argv[1:]))
+    
     while True:
         try:
             print("\n" + "=" * 50)
@@ -817,10 +3638,11 @@ def main():
             
             print(f"\n📋 MENU PRINCIPAL:")
             print(f"1. Télécharger fichier SP3")
-            print(f"2. ⚙️  Paramètres")
-            print(f"3. ❌ Quitter")
+            print(f"2. 📆 Téléchargement groupé (période)")
+            print(f"3. ⚙️  Paramètres")
+            print(f"4. ❌ Quitter")
             
-            choice = input("\nChoix (1-3): ").strip()
+            choice = input("\nChoix (1-4): ").strip()
             
             if choice == '1':
                 # Téléchargement SP3
@@ -828,10 +3650,15 @@ def main():
                 download_sp3_file(config_manager)
             
             elif choice == '2':
+                # Téléchargement groupé
+                print("\n" + "-" * 30)
+                download_sp3_range(config_manager)
+            
+            elif choice == '3':
                 # Menu paramètres
                 show_settings_menu(config_manager)
             
-            elif choice == '3':
+            elif choice == '4':
                 print("👋 Au revoir!")
                 break
             
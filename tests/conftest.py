@@ -0,0 +1,77 @@
+"""Miroir HTTP local et téléchargeur configuré pour les tests"""
+
+import contextlib
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import sp3exe
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve(name, root):
+    """Répertoire servi par un serveur HTTP local : dictionnaire de configuration du miroir"""
+    handler = functools.partial(QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield {'name': name, 'base': f'http://127.0.0.1:{server.server_address[1]}',
+               'layout': '{base}/{week:04d}/'}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def mirror_root(tmp_path):
+    root = tmp_path / 'mirror'
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def mirror(mirror_root):
+    with serve('LOCAL', mirror_root) as config:
+        yield config
+
+
+@pytest.fixture
+def other_mirror_root(tmp_path):
+    root = tmp_path / 'other_mirror'
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def other_mirror(other_mirror_root):
+    with serve('OTHER', other_mirror_root) as config:
+        yield config
+
+
+@pytest.fixture
+def make_downloader(tmp_path):
+    """Téléchargeur isolé dans tmp_path, sans nouvelles tentatives lentes"""
+    def make(**overrides):
+        config = sp3exe.ConfigManager()
+        config.config_dir = tmp_path
+        config.config_file = tmp_path / 'sp3_config.json'
+        config.config = config.default_config.copy()
+        config.config.update({
+            'output_directory': str(tmp_path / 'out'),
+            'max_retries': 0,
+            'download_retries': 1,
+            'backoff_factor': 0,
+            'backoff_jitter': 0,
+            'build_epoch_index': False,
+        })
+        config.config.update(overrides)
+        return sp3exe.SP3CombinedDownloader(config)
+    return make
@@ -0,0 +1,52 @@
+"""Cache JSON partagé entre plusieurs processus"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import sp3exe
+
+
+def add_entries(cache_file, prefix, count):
+    cache = sp3exe.ExpiringJsonCache(cache_file)
+    for i in range(count):
+        cache.set(f'{prefix}{i}', i)
+        assert cache.save()
+
+
+def test_save_merges_entries_from_other_instances(tmp_path):
+    cache_file = tmp_path / 'index.json'
+    first = sp3exe.ExpiringJsonCache(cache_file)
+    second = sp3exe.ExpiringJsonCache(cache_file)
+    
+    first.set('a', 1)
+    first.save()
+    second.set('b', 2)
+    second.save()
+    
+    assert sp3exe.ExpiringJsonCache(cache_file).entries.keys() == {'a', 'b'}
+    assert second.get('a') == 1
+
+
+def test_local_changes_win_over_disk(tmp_path):
+    cache_file = tmp_path / 'index.json'
+    first = sp3exe.ExpiringJsonCache(cache_file)
+    second = sp3exe.ExpiringJsonCache(cache_file)
+    
+    first.set('key', 'old')
+    first.save()
+    second.set('key', 'new')
+    second.save()
+    first.save()
+    
+    assert sp3exe.ExpiringJsonCache(cache_file).get('key') == 'new'
+
+
+def test_concurrent_processes_lose_no_entry(tmp_path):
+    cache_file = tmp_path / 'index.json'
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(add_entries, cache_file, prefix, 25) for prefix in 'abcd']
+        for future in futures:
+            future.result()
+    
+    entries = sp3exe.ExpiringJsonCache(cache_file).entries
+    assert len(entries) == 100
+    assert not list(tmp_path.glob('*.tmp'))
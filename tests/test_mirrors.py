@@ -0,0 +1,94 @@
+"""Découverte et classement des miroirs, avec un miroir injoignable"""
+
+import gzip
+from datetime import datetime, timedelta
+
+import sp3exe
+
+# Port 9 (discard) : connexion refusée, miroir injoignable
+DEAD_MIRROR = {'name': 'DEAD', 'base': 'http://127.0.0.1:9', 'layout': '{base}/{week:04d}/'}
+
+TARGET_DATE = datetime(2025, 2, 15)
+PRODUCT = 'COD0MGXFIN_20250460000_01D_05M_ORB.SP3.gz'
+GPS_WEEK = 2353
+CONTENT = b'#dP2025  2 15  0  0  0.00000000     289 ORBIT IGS20 FIT  COD\n*  2025  2 15  0  0  0.00000000\nEOF\n'
+
+
+def publish(mirror_root):
+    week_dir = mirror_root / f'{GPS_WEEK:04d}'
+    week_dir.mkdir()
+    (week_dir / PRODUCT).write_bytes(gzip.compress(CONTENT))
+
+
+def test_ordered_ranks_failed_mirrors_last(tmp_path):
+    mirrors = sp3exe.MirrorSet([{'name': name, 'base': f'http://{name.lower()}.test'}
+                                for name in ('A', 'B', 'C', 'D')], tmp_path / 'stats.json')
+    mirrors.record_transfer('http://b.test/x', 1000, 1.0)
+    mirrors.record_transfer('http://c.test/x', 5000, 1.0)
+    mirrors.record_transfer('http://a.test/x', 9000, 1.0)
+    mirrors.record_failure('http://a.test/x')
+    
+    # Mesurés sains par débit, puis sans mesure, puis en échec
+    assert [m.name for m in mirrors.ordered()] == ['C', 'B', 'D', 'A']
+    
+    # Un transfert réussi rétablit le miroir
+    mirrors.record_transfer('http://a.test/x', 9000, 1.0)
+    assert [m.name for m in mirrors.ordered()][0] == 'A'
+
+
+def test_discovery_falls_through_dead_mirror(mirror, mirror_root, make_downloader):
+    publish(mirror_root)
+    downloader = make_downloader(mirrors=[DEAD_MIRROR, mirror])
+    
+    resolved = downloader.resolve_product_type(TARGET_DATE, 'final')
+    
+    assert resolved == (f"{mirror['base']}/{GPS_WEEK:04d}/{PRODUCT}", PRODUCT, GPS_WEEK)
+    assert [m.name for m in downloader.mirrors.ordered()] == ['LOCAL', 'DEAD']
+    assert downloader.mirrors.stats.get('DEAD')['failed']
+
+
+def test_dead_mirror_does_not_keep_discovery(mirror, mirror_root, make_downloader):
+    publish(mirror_root)
+    downloader = make_downloader(mirrors=[DEAD_MIRROR, mirror], race_mirrors=True)
+    
+    result = downloader.download_best_product(TARGET_DATE)
+    
+    assert result is not None
+    assert open(result, 'rb').read() == CONTENT
+    
+    # Statistiques persistantes : l'exécution suivante commence par le miroir sain
+    again = make_downloader(mirrors=[DEAD_MIRROR, mirror])
+    assert [m.name for m in again.mirrors.ordered()] == ['LOCAL', 'DEAD']
+
+
+def test_unreachable_mirrors_only(make_downloader):
+    downloader = make_downloader(mirrors=[DEAD_MIRROR])
+    
+    assert downloader.resolve_product_type(TARGET_DATE, 'final') is None
+    assert downloader.mirrors.stats.get('DEAD')['failed']
+
+
+def test_recent_miss_checks_other_mirrors(mirror, mirror_root, other_mirror, other_mirror_root,
+                                          make_downloader):
+    downloader = make_downloader(mirrors=[mirror, other_mirror])
+    target = sp3exe.utc_now() - timedelta(days=2)
+    filenames, gps_week, _ = downloader.generate_combined_sp3_filenames(target, 'rapid')
+    # Le miroir le mieux classé n'a pas encore synchronisé le produit
+    (mirror_root / f'{gps_week:04d}').mkdir()
+    (mirror_root / f'{gps_week:04d}' / 'README').write_text('vide')
+    week_dir = other_mirror_root / f'{gps_week:04d}'
+    week_dir.mkdir()
+    (week_dir / filenames[0]).write_bytes(gzip.compress(CONTENT))
+    
+    resolved = downloader.resolve_product_type(target, 'rapid')
+    
+    assert resolved == (f"{other_mirror['base']}/{gps_week:04d}/{filenames[0]}", filenames[0], gps_week)
+
+
+def test_frozen_week_miss_stops_at_first_mirror(mirror, mirror_root, other_mirror, other_mirror_root,
+                                                make_downloader):
+    publish(other_mirror_root)
+    (mirror_root / f'{GPS_WEEK:04d}').mkdir()
+    downloader = make_downloader(mirrors=[mirror, other_mirror])
+    
+    assert downloader.resolve_product_type(TARGET_DATE, 'final') is None
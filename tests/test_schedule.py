@@ -0,0 +1,59 @@
+"""Modèle de publication appris depuis le catalogue"""
+
+from datetime import datetime, timedelta, timezone
+
+import sp3exe
+
+PRODUCTS = {
+    'products': {
+        'final': {'publication_latency_hours': {'default': 288, 'centers': {'COD': 240, 'GFZ': 400}}},
+        'rapid': {'publication_latency_hours': {'default': 24}},
+    }
+}
+
+
+def test_observed_latency_replaces_configured():
+    schedule = sp3exe.PublicationSchedule(PRODUCTS, {('COD', 'final'): 300.0, ('IGS', 'rapid'): 12.0})
+    
+    # Plus tard que configuré : la latence apprise l'emporte aussi à la hausse
+    assert schedule.latency('COD', 'final') == 300.0
+    assert schedule.latency('IGS', 'rapid') == 12.0
+    assert schedule.latency('WUM', 'final') == 288
+    assert schedule.earliest('final') == 288
+    assert schedule.latest('final') == 400
+
+
+def record(catalog, tmp_path, name, published, downloaded_at):
+    path = tmp_path / name.replace('.gz', '')
+    path.write_bytes(b'#dP2025  2 15  0  0  0.00000000     289 ORBIT IGS20 FIT  COD\nEOF\n')
+    catalog.record(name, path, published=published)
+    with catalog.connection:
+        catalog.connection.execute("UPDATE products SET downloaded_at = ? WHERE path = ?",
+                                   (downloaded_at.replace(tzinfo=timezone.utc).timestamp(), str(path)))
+
+
+def test_catalog_latencies_ignore_archives(tmp_path):
+    catalog = sp3exe.ProductCatalog(tmp_path / 'catalog.db')
+    start = datetime(2025, 2, 15)
+    record(catalog, tmp_path, 'COD0OPSFIN_20250460000_01D_05M_ORB.SP3.gz',
+           start + timedelta(hours=330), start + timedelta(hours=340))
+    # Archive recopiée des années plus tard : sans rapport avec la publication
+    record(catalog, tmp_path, 'GFZ0OPSFIN_20220010000_01D_05M_ORB.SP3.gz',
+           datetime(2024, 6, 1), datetime(2024, 6, 2))
+    
+    assert catalog.publication_latencies() == {('COD', 'final'): 330.0}
+
+
+def test_listing_cached_until_slowest_final(make_downloader):
+    downloader = make_downloader()
+    downloader.schedule = sp3exe.PublicationSchedule(PRODUCTS)
+    week_end = downloader.gps_epoch() + timedelta(weeks=2354)
+    hours = (sp3exe.utc_now() - week_end).total_seconds() / 3600
+    
+    # Entre la latence du centre le plus rapide et celle du plus lent, le listing peut encore changer
+    downloader.schedule.configured['final']['centers'] = {'COD': hours - 10, 'GFZ': hours + 10}
+    downloader.schedule.configured['final']['default'] = hours - 10
+    assert downloader.listing_ttl(2353) is not None
+    
+    downloader.schedule.configured['final']['centers']['GFZ'] = hours - 5
+    assert downloader.listing_ttl(2353) is None
@@ -0,0 +1,47 @@
+"""Classement des centres par le tableau de bord"""
+
+from datetime import datetime, timedelta
+
+import sp3exe
+
+NOW = datetime(2025, 3, 1, 12)
+RECENT = [f'{center}0OPSFIN_20250500000_01D_15M_ORB.SP3.gz' for center in ('IGS', 'COD', 'GFZ', 'WUM')]
+
+
+def test_archive_transfer_keeps_order(tmp_path):
+    scoreboard = sp3exe.CenterScoreboard(tmp_path / 'scoreboard.json')
+    archive = 'COD0OPSFIN_20220010000_01D_15M_ORB.SP3.gz'
+    # Produit d'archive republié : son Last-Modified ne dit rien du délai de publication
+    scoreboard.record_transfer(archive, 1.0, NOW, published=NOW - timedelta(days=30))
+    
+    assert scoreboard.reorder(RECENT, NOW) == RECENT
+
+
+def test_release_delay_learned_from_last_modified(tmp_path):
+    scoreboard = sp3exe.CenterScoreboard(tmp_path / 'scoreboard.json')
+    # COD publie ses finaux 20 jours après leur début : un produit de 10 jours est rarement en ligne
+    start = datetime(2025, 1, 20)
+    scoreboard.record_transfer('COD0OPSFIN_20250200000_01D_15M_ORB.SP3.gz', 1.0, start + timedelta(days=21),
+                               published=start + timedelta(days=20))
+    
+    assert scoreboard.reorder(RECENT, NOW) == [RECENT[0], RECENT[2], RECENT[3], RECENT[1]]
+
+
+def test_release_delay_moves_both_ways(tmp_path):
+    scoreboard = sp3exe.CenterScoreboard(tmp_path / 'scoreboard.json')
+    start = datetime(2025, 1, 20)
+    name = 'COD0OPSFIN_20250200000_01D_15M_ORB.SP3.gz'
+    product = sp3exe.ProductName.parse(name)
+    
+    scoreboard.record_transfer(name, 1.0, start + timedelta(days=21), published=start + timedelta(days=10))
+    first = scoreboard.stats(product)['release']
+    scoreboard.record_transfer(name, 1.0, start + timedelta(days=21), published=start + timedelta(days=20))
+    
+    assert first == 240
+    assert scoreboard.stats(product)['release'] > first
+
+
+def test_http_date():
+    assert sp3exe.http_date('Sat, 15 Feb 2025 10:30:00 GMT') == datetime(2025, 2, 15, 10, 30)
+    assert sp3exe.http_date(None) is None
+    assert sp3exe.http_date('pas une date') is None
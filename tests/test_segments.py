@@ -0,0 +1,37 @@
+"""Empreinte des transferts segmentés"""
+
+import hashlib
+import random
+
+import sp3exe
+
+DATA = random.Random(19).randbytes(100000)
+
+
+def chunks(start, end, size=4096):
+    return [(offset, DATA[offset:min(offset + size, end)]) for offset in range(start, end, size)]
+
+
+def test_out_of_order_segments(tmp_path):
+    hasher = sp3exe.SegmentHasher(tmp_path / 'file.segments')
+    segments = [chunks(0, 30000), chunks(30000, 70000), chunks(70000, 100000)]
+    # Plages entrelacées, la dernière reçue en premier
+    for segment in (segments[2], segments[1]):
+        for offset, data in segment:
+            hasher.update(offset, data)
+    for offset, data in segments[0]:
+        hasher.update(offset, data)
+    
+    assert hasher.hexdigest() == hashlib.sha512(DATA).hexdigest()
+    assert not hasher.pending
+
+
+def test_resumed_ranges_read_from_disk(tmp_path):
+    path = tmp_path / 'file.segments'
+    path.write_bytes(DATA[:20000] + bytes(30000) + DATA[50000:60000] + bytes(40000))
+    # Octets déjà écrits : [0, 20000) et [50000, 60000)
+    hasher = sp3exe.SegmentHasher(path, {0: 20000, 50000: 60000})
+    for offset, data in chunks(60000, 100000) + chunks(20000, 50000):
+        hasher.update(offset, data)
+    
+    assert hasher.hexdigest() == hashlib.sha512(DATA).hexdigest()
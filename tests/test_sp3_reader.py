@@ -0,0 +1,213 @@
+"""Lecture SP3 vectorisée comparée aux valeurs écrites : en-tête SP3-d, sentinelles, fenêtres"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import sp3exe
+
+np = pytest.importorskip('numpy')
+
+START = datetime(2025, 2, 15)
+INTERVAL = 300
+N_EPOCHS = 12
+# 90 satellites : plus de 85, soit 6 lignes '+' et 6 lignes '++' en SP3-d
+SATELLITES = ([f'G{prn:02d}' for prn in range(1, 33)] + [f'R{prn:02d}' for prn in range(1, 25)]
+              + [f'E{prn:02d}' for prn in range(1, 35)])
+# Identifiants à blancs des anciens fichiers : "G 1" pour G01
+BLANK_PADDED = {'G01': 'G 1', 'G02': 'G 2', 'R07': 'R 7'}
+
+MISSING = (3, 'E05')
+BAD_CLOCK = (4, 'G10')
+ZERO_POSITION = (5, 'R02')
+# Ligne hors format F14.6 : impose la conversion générique des chaînes
+LOOSE = (6, 'G03')
+
+
+def sp3_id(sat_id):
+    return BLANK_PADDED.get(sat_id, sat_id)
+
+
+def satellite_lines(prefix, count_field):
+    """Lignes '+' ou '++' de l'en-tête, 17 champs de 3 caractères par ligne"""
+    lines = []
+    for row in range(0, len(SATELLITES), 17):
+        fields = [count_field(sat_id) for sat_id in SATELLITES[row:row + 17]]
+        fields += ['  0'] * (17 - len(fields))
+        lead = f'+  {len(SATELLITES):3d}   ' if prefix == '+' and row == 0 else prefix.ljust(9)
+        lines.append(lead + ''.join(fields))
+    return lines
+
+
+def write_sp3(path, velocities=False):
+    """Écrit un fichier SP3-d synthétique et retourne les valeurs attendues"""
+    rng = random.Random(2353)
+    accuracy = {sat_id: rng.randint(1, 20) for sat_id in SATELLITES}
+    positions = np.full((N_EPOCHS, len(SATELLITES), 4), np.nan)
+    rates = np.full((N_EPOCHS, len(SATELLITES), 4), np.nan)
+    
+    lines = [
+        f'#d{"V" if velocities else "P"}{START.year:4d} {START.month:2d} {START.day:2d}  0  0  0.00000000 '
+        f'{N_EPOCHS:7d} ORBIT IGS20 FIT  COD',
+        f'## 2353 518400.00000000 {INTERVAL:14.8f} 60721 0.0000000000000',
+    ]
+    lines += satellite_lines('+', sp3_id)
+    lines += satellite_lines('++', lambda sat_id: f'{accuracy[sat_id]:3d}')
+    lines += ['%c M  cc GPS ccc cccc cccc cccc cccc ccccc ccccc ccccc ccccc',
+              '%f  1.2500000  1.025000000  0.00000000000  0.000000000000000',
+              '/* synthetic test product']
+    
+    for epoch in range(N_EPOCHS):
+        t = START + timedelta(seconds=epoch * INTERVAL)
+        lines.append(f'*  {t.year:4d} {t.month:2d} {t.day:2d} {t.hour:2d} {t.minute:2d} {t.second:11.8f}')
+        for column, sat_id in enumerate(SATELLITES):
+            if (epoch, sat_id) == MISSING:
+                continue
+            values = [round(rng.uniform(-3e4, 3e4), 6) for _ in range(3)] + [round(rng.uniform(-1e3, 1e3), 6)]
+            if (epoch, sat_id) == BAD_CLOCK:
+                values[3] = 999999.999999
+            if (epoch, sat_id) == ZERO_POSITION:
+                values[:3] = [0.0, 0.0, 0.0]
+            if (epoch, sat_id) == LOOSE:
+                values = [round(value, 5) for value in values]
+                lines.append(f'P{sp3_id(sat_id)}' + ''.join(f'{value:13.5f} ' for value in values))
+            else:
+                lines.append(f'P{sp3_id(sat_id)}' + ''.join(f'{value:14.6f}' for value in values))
+            positions[epoch, column] = values
+    
+            if velocities:
+                values = [round(rng.uniform(-4e4, 4e4), 6) for _ in range(4)]
+                lines.append(f'V{sp3_id(sat_id)}' + ''.join(f'{value:14.6f}' for value in values))
+                rates[epoch, column] = values
+    
+    lines.append('EOF')
+    path.write_text('\n'.join(lines) + '\n')
+    return positions, (rates if velocities else None), [accuracy[sat_id] for sat_id in SATELLITES]
+
+
+@pytest.fixture
+def sp3_file(tmp_path):
+    path = tmp_path / 'COD0MGXFIN_20250460000_01D_05M_ORB.SP3'
+    return (path,) + write_sp3(path)
+
+
+def test_header_with_more_than_85_satellites(sp3_file):
+    path, _, _, accuracy = sp3_file
+    header = sp3exe.read_sp3_header(path)
+    
+    assert header['version'] == 'd'
+    assert header['n_epochs'] == N_EPOCHS
+    assert header['interval'] == INTERVAL
+    assert header['time_system'] == 'GPS'
+    assert header['satellites'] == SATELLITES
+    assert header['accuracy'] == accuracy
+    assert header['constellations'] == {'G': 32, 'R': 24, 'E': 34}
+
+
+def test_read_matches_written_values(sp3_file):
+    path, positions, _, accuracy = sp3_file
+    data = sp3exe.read_sp3(path)
+    
+    first = int((START - sp3exe.GPS_EPOCH).total_seconds())
+    assert data.epochs.tolist() == [first + epoch * INTERVAL for epoch in range(N_EPOCHS)]
+    assert data.records.shape == (N_EPOCHS, len(SATELLITES), 4)
+    np.testing.assert_allclose(data.records, positions, rtol=0, atol=1e-9)
+    assert data.velocities is None
+    assert data.accuracy.tolist() == accuracy
+
+
+def test_blank_padded_identifiers(sp3_file):
+    path, positions, _, _ = sp3_file
+    data = sp3exe.read_sp3(path)
+    
+    for sat_id in BLANK_PADDED:
+        column = SATELLITES.index(sat_id)
+        assert not np.isnan(data.records[:, column]).any()
+        np.testing.assert_allclose(data.records[:, column], positions[:, column], rtol=0, atol=1e-9)
+
+
+def test_sentinels_and_missing_records(sp3_file):
+    path, _, _, _ = sp3_file
+    data = sp3exe.read_sp3(path)
+    
+    def bad(epoch, sat_id):
+        return data.bad[epoch, SATELLITES.index(sat_id)].tolist()
+    
+    assert bad(*MISSING) == [True] * 4
+    assert bad(*BAD_CLOCK) == [False, False, False, True]
+    assert bad(*ZERO_POSITION) == [True, True, True, False]
+    assert bad(*LOOSE) == [False] * 4
+    assert data.bad.sum() == 4 + 1 + 3
+
+
+def test_velocity_records(tmp_path):
+    path = tmp_path / 'velocities.sp3'
+    positions, rates, _ = write_sp3(path, velocities=True)
+    data = sp3exe.read_sp3(path)
+    
+    assert sp3exe.read_sp3_header(path)['pos_vel'] == 'V'
+    np.testing.assert_allclose(data.records, positions, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(data.velocities, rates, rtol=0, atol=1e-9)
+
+
+def lines_array(lines):
+    return np.frombuffer(''.join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1)
+
+
+def test_decode_fields_digit_arithmetic():
+    lines = ['PG01 -12345.678901      0.000001     -0.500000 999999.999999',
+             'PG02  26559.123456 -26559.123456      1.000000   -123.456789']
+    values = sp3exe.decode_sp3_fields(lines_array(lines))
+    
+    assert values.tolist() == [[-12345.678901, 0.000001, -0.5, 999999.999999],
+                               [26559.123456, -26559.123456, 1.0, -123.456789]]
+
+
+def test_decode_fields_falls_back_on_other_formats():
+    loose = (-12345.6789, 0.00001, -0.5, 999999.99999)
+    lines = ['PG01' + ''.join(f'{value:13.5f} ' for value in loose),
+             'PG02  26559.123456 -26559.123456      1.000000   -123.456789']
+    values = sp3exe.decode_sp3_fields(lines_array(lines))
+    
+    np.testing.assert_allclose(values, [loose, [26559.123456, -26559.123456, 1.0, -123.456789]],
+                               rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('first, last', [(0, N_EPOCHS), (2, 7), (5, 6), (7, N_EPOCHS), (4, 4)])
+def test_window_matches_full_read(sp3_file, first, last):
+    path = sp3_file[0]
+    full = sp3exe.read_sp3(path)
+    start = START + timedelta(seconds=first * INTERVAL)
+    end = START + timedelta(seconds=last * INTERVAL)
+    
+    window = sp3exe.read_sp3_window(path, start, end)
+    
+    assert window.epochs.tolist() == full.epochs[first:last].tolist()
+    np.testing.assert_array_equal(window.records, full.records[first:last])
+    np.testing.assert_array_equal(window.bad, full.bad[first:last])
+
+
+def test_reader_matches_full_read(sp3_file):
+    path = sp3_file[0]
+    full = sp3exe.read_sp3(path)
+    
+    with sp3exe.SP3Reader(path, block_epochs=5) as reader:
+        assert len(reader) == N_EPOCHS
+    
+        # Colonne décodée seule, puis depuis les blocs en cache
+        for sat_id in ('G01', 'G10', 'R02', 'E05', 'E34'):
+            column = SATELLITES.index(sat_id)
+            satellite = reader[sat_id]
+            np.testing.assert_array_equal(satellite.records[:, 0], full.records[:, column])
+            np.testing.assert_array_equal(satellite.bad[:, 0], full.bad[:, column])
+    
+        sliced = reader[3:11]
+        np.testing.assert_array_equal(sliced.records, full.records[3:11])
+        np.testing.assert_array_equal(sliced.bad, full.bad[3:11])
+    
+        window = reader.window(START + timedelta(seconds=4 * INTERVAL), START + timedelta(hours=1))
+        np.testing.assert_array_equal(window.records, full.records[4:N_EPOCHS])
+    
+        column = SATELLITES.index('G03')
+        np.testing.assert_array_equal(reader['G03'].records[:, 0], full.records[:, column])
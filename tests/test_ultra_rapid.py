@@ -0,0 +1,51 @@
+"""Ultra-rapides déjà téléchargés : une émission plus récente reste à chercher sur le réseau"""
+
+import gzip
+from datetime import timedelta
+
+import sp3exe
+
+CONTENT = b'#dP2026 10 14 12  0  0.00000000     289 ORBIT IGS20 HLM  IGS\nEOF\n'
+NEWER = b'#dP2026 10 14 18  0  0.00000000     289 ORBIT IGS20 HLM  IGS\nEOF\n'
+
+
+def issues(downloader, target):
+    """Premier candidat des deux émissions prioritaires (la plus récente d'abord)"""
+    filenames, gps_week, _ = downloader.generate_combined_sp3_filenames(target, 'ultra_rapid')
+    starts = {}
+    for filename in filenames:
+        starts.setdefault(sp3exe.ProductName.parse(filename).start, filename)
+    newest, previous = list(starts.values())[:2]
+    return newest, previous, gps_week
+
+
+def test_newer_issue_is_fetched_despite_local_copy(mirror, mirror_root, make_downloader):
+    downloader = make_downloader(mirrors=[mirror])
+    target = sp3exe.utc_now() - timedelta(days=1)
+    newest, previous, gps_week = issues(downloader, target)
+    week_dir = mirror_root / f'{gps_week:04d}'
+    week_dir.mkdir()
+    (week_dir / previous).write_bytes(gzip.compress(CONTENT))
+    
+    first = downloader.download_product_type(target, 'ultra_rapid')
+    assert open(first, 'rb').read() == CONTENT
+    assert downloader.find_cached_product([newest, previous], current=True) is None
+    
+    # L'émission suivante paraît : la copie locale antérieure ne court-circuite pas le réseau
+    (week_dir / newest).write_bytes(gzip.compress(NEWER))
+    downloader.listing_cache.entries.clear()
+    second = downloader.download_product_type(target, 'ultra_rapid')
+    assert open(second, 'rb').read() == NEWER
+
+
+def test_older_issue_serves_when_network_fails(mirror, mirror_root, make_downloader):
+    downloader = make_downloader(mirrors=[mirror])
+    target = sp3exe.utc_now() - timedelta(days=1)
+    _, previous, gps_week = issues(downloader, target)
+    (mirror_root / f'{gps_week:04d}').mkdir()
+    (mirror_root / f'{gps_week:04d}' / previous).write_bytes(gzip.compress(CONTENT))
+    first = downloader.download_product_type(target, 'ultra_rapid')
+    
+    offline = make_downloader(mirrors=[{'name': 'DEAD', 'base': 'http://127.0.0.1:9',
+                                        'layout': '{base}/{week:04d}/'}])
+    assert offline.download_product_type(target, 'ultra_rapid') == first
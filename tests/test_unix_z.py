@@ -0,0 +1,65 @@
+"""Décodeur LZW (.Z) intégré comparé octet par octet à ncompress"""
+
+import random
+
+import pytest
+
+import sp3exe
+
+ncompress = pytest.importorskip('ncompress')
+
+rng = random.Random(2160)
+SP3_TEXT = b''.join(
+    b'PG%02d %13.6f %13.6f %13.6f %13.6f\n' % (
+        i % 32 + 1, rng.uniform(-3e4, 3e4), rng.uniform(-3e4, 3e4),
+        rng.uniform(-3e4, 3e4), rng.uniform(-1e3, 1e3))
+    for i in range(6000))
+RANDOM_DATA = rng.randbytes(150000)
+
+PAYLOADS = {
+    'sp3': SP3_TEXT,
+    'random': RANDOM_DATA,
+    # Le taux de compression chute sur le bruit : ncompress émet des codes CLEAR
+    'clear': SP3_TEXT + RANDOM_DATA + SP3_TEXT,
+    'short': b'a',
+    'repeat': b'ab' * 40000,
+}
+
+
+def decode(compressed, chunk_size):
+    decoder = sp3exe.UnixZDecoder()
+    output = [decoder.decompress(compressed[i:i + chunk_size])
+              for i in range(0, len(compressed), chunk_size)]
+    output.append(decoder.flush())
+    return b''.join(output)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 8192])
+@pytest.mark.parametrize('name', sorted(PAYLOADS))
+def test_matches_ncompress(name, chunk_size):
+    data = PAYLOADS[name]
+    assert decode(ncompress.compress(data), chunk_size) == data
+
+
+def test_clear_codes_reset_table():
+    compressed = ncompress.compress(PAYLOADS['clear'])
+    decoder = sp3exe.UnixZDecoder()
+    resets = 0
+    for i in range(0, len(compressed), 8192):
+        before = len(decoder.table)
+        decoder.decompress(compressed[i:i + 8192])
+        resets += len(decoder.table) < before
+    assert resets > 0
+
+
+def test_truncated_stream_yields_prefix():
+    data = PAYLOADS['sp3']
+    compressed = ncompress.compress(data)
+    output = decode(compressed[:len(compressed) // 2], 8192)
+    assert 0 < len(output) < len(data)
+    assert data.startswith(output)
+
+
+def test_invalid_header():
+    with pytest.raises(sp3exe.UnixZError):
+        sp3exe.UnixZDecoder().decompress(b'\x1f\x8b\x08\x00')